@@ -1,57 +1,51 @@
-import csv, os 
-
-debug = False 
-
-home = os.getcwd() 
-dataset_path = os.path.join(home, "level1-CVresults") 
-acc_path = os.path.join(home, "level1-CV-acc-LS")
-
-if not os.path.exists(acc_path): 
-	os.mkdir(acc_path)
-
-os.chdir(dataset_path) 
-
-dataset_cnt = 0
-for dataset in os.listdir(dataset_path): 
-	if dataset[:2] == "LS": 
-		print("dataset " + str(dataset_cnt))
-		dataset_cnt += 1
-		with open(dataset) as f: 
-			reader = csv.reader(f)
-			line = [row for row in reader] 
-		line = line[1:]
-
-		label = 2 
-		res = []
-		fold_cnt = 0 
-		for outer_fold in range(4, len(line[0]), 3): 
-			fold_cnt += 1
-			if debug: 
-				print("fold cnt: " + str(fold_cnt))
-			fold_res = [0 for i in range(10)]
-			fold_tst_cnt = [0 for i in range(10)]
-			for row in range(len(line)): 
-				fold_tst_cnt[int(line[row][outer_fold])] += 1
-				if float(line[row][outer_fold+1]) > float(line[row][outer_fold+2]): 
-					if float(line[row][label]) == 0.0: 
-						fold_res[int(line[row][outer_fold])] += 1
-				if float(line[row][outer_fold+1]) < float(line[row][outer_fold+2]): 
-					if float(line[row][label]) == 1.0: 
-						fold_res[int(line[row][outer_fold])] += 1
-			for i in range(10): 
-				res.append(fold_res[i]/fold_tst_cnt[i])
-			if debug: 
-				print(fold_res)
-				print(fold_tst_cnt)
-		if debug: 
-			print(res)
-
-		os.chdir(acc_path)
-		result_file_name = dataset[:len(dataset)-4] + ".csv" 
-		with open(result_file_name, "w") as f: 
-			writer = csv.writer(f)
-			writer.writerow(res)
-		os.chdir(dataset_path)
-
-	if dataset_cnt == 1800: 
-		break 
+import csv, os, argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+def fold_accuracies(filename, n_folds=10):
+	'''Accuracy of each inner fold of each outer fold of one CV result file, outer fold by outer fold.
+
+	Column 2 holds the label and every outer fold takes three columns from column 4 on:
+	the inner fold index of the row and the predicted probabilities of label 0 and label 1.'''
+	table = np.loadtxt(filename, delimiter=",", skiprows=1, ndmin=2)
+	label = table[:, 2]
+	n_outer = len(range(4, table.shape[1], 3))
+	fold = table[:, 4:4+3*n_outer:3].astype(np.int64)
+	prob0 = table[:, 5:5+3*n_outer:3]
+	prob1 = table[:, 6:6+3*n_outer:3]
+
+	correct = ((prob0 > prob1) & (label == 0.0)[:, None]) | ((prob0 < prob1) & (label == 1.0)[:, None])
+
+	#one bincount over all (outer fold, inner fold) pairs
+	codes = (fold + n_folds * np.arange(n_outer)).ravel()
+	fold_res = np.bincount(codes, weights=correct.ravel(), minlength=n_folds*n_outer)
+	fold_tst_cnt = np.bincount(codes, minlength=n_folds*n_outer)
+	return fold_res / fold_tst_cnt
+
+def write_accuracies(dataset_path, acc_path, dataset, n_folds=10):
+	res = fold_accuracies(os.path.join(dataset_path, dataset), n_folds)
+	result_file_name = dataset[:len(dataset)-4] + ".csv"
+	with open(os.path.join(acc_path, result_file_name), "w") as f:
+		writer = csv.writer(f)
+		writer.writerow(res.tolist())
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Compute inner fold accuracies from level 1 CV results. ")
+	parser.add_argument("--cv-results", default=os.path.join(os.getcwd(), "level1-CVresults"), help="folder of CV result files")
+	parser.add_argument("--output", default=os.path.join(os.getcwd(), "level1-CV-acc-LS"), help="folder to write accuracies to")
+	parser.add_argument("--prefix", default="LS", help="only process CV result files starting with this prefix")
+	parser.add_argument("--limit", type=int, default=None, help="stop after this many files")
+	parser.add_argument("--folds", type=int, default=10, help="number of inner folds")
+	parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+	args = parser.parse_args(argv)
+
+	os.makedirs(args.output, exist_ok=True)
+	datasets = sorted(dataset for dataset in os.listdir(args.cv_results) if dataset.startswith(args.prefix))[:args.limit]
+	with ProcessPoolExecutor(max_workers=args.workers) as executor:
+		futures = [executor.submit(write_accuracies, args.cv_results, args.output, dataset, args.folds) for dataset in datasets]
+		for dataset_cnt, future in enumerate(futures):
+			future.result()
+			print("dataset " + str(dataset_cnt))
+
+if __name__ == "__main__":
+	main()
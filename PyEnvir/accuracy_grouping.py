@@ -1,49 +1,77 @@
-import os
-
-for datasetGrp in ["LS-DT", "LS-KNN", "LS-NB"]: # 3 files of 4
-    os.chdir(f"..\\Dataset\\artificial-new\\MetaLabels\\level1-CV-accy-{datasetGrp}")
-    fileAccyVals = [] # 6000 * 10 values
-    lvlHeaders = []
-    for level in ["two", "four", "six", "eight", "ten", "twelve", "fourteen", "sixteen", "eighteen", "twenty"]:
-        lvlHeaders += [level for _ in range(2000)]
-    fileAccyVals.append(lvlHeaders)
-    for algo in ["DT", "KNN", "NB"]: # 3 columns
-        colAccyVals = [] # 6000 values
-        for l in range(2, 21, 2): # 10 sections
-            level = "{:0>2d}".format(l)
-            for var1 in ["A", "B", "V", "G", "D"]:
-                for var2 in range(1, 5):
-                    filename = f"LS{level}{var1}{var2}-{datasetGrp.split('-')[1]}-{algo}.csv"                 
-                    with open(filename) as file:
-                        fields = list(file)[0][:-1].split(',')
-                        colAccyVals += fields
-        fileAccyVals.append(colAccyVals)
-    serialized = ""
-    for column in list(map(list, zip(*fileAccyVals))):
-        serialized += ','.join(column) + '\n'
-    with open(f"{datasetGrp}-ACCY-SMRY.csv", 'w') as file:
-        file.write(serialized)
-
-for datasetGrp in ["RT"]: # 1 file of 4
-    os.chdir(f"..\\Dataset\\artificial-new\\MetaLabels\\level1-CV-accy-{datasetGrp}")
-    fileAccyVals = [] # 6000 * 10 values
-    lvlHeaders = []
-    for level in ["one", "two", "tree", "four", "five", "six", "seven", "eight", "niner", "ten"]:
-        lvlHeaders += [level for _ in range(2000)]
-    fileAccyVals.append(lvlHeaders)
-    for algo in ["DT", "KNN", "NB"]: # 3 columns
-        colAccyVals = [] # 6000 values
-        for l in range(2, 21, 2): # 10 sections
-            level = "{:0>2d}".format(l)
-            for v in range(1, 21):
-                var = "{:0>2d}".format(v)
-                filename = f"RT{level}-{var}-{algo}.csv"              
-                with open(filename) as file:
-                    fields = list(file)[0][:-1].split(',')
-                    colAccyVals += fields
-        fileAccyVals.append(colAccyVals)
-    serialized = ""
-    for column in list(map(list, zip(*fileAccyVals))):
-        serialized += ','.join(column) + '\n'
-    with open(f"{datasetGrp}-ACCY-SMRY.csv", 'w') as file:
-        file.write(serialized)
+import os, argparse
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+#dataset families: the groups summarised, the name of each level and the accuracy file of a (level, variant, algorithm)
+FAMILIES = {
+    "LS": {
+        "groups": ["LS-DT", "LS-KNN", "LS-NB"],
+        "levelNames": ["two", "four", "six", "eight", "ten", "twelve", "fourteen", "sixteen", "eighteen", "twenty"],
+        "levels": ["{:0>2d}".format(l) for l in range(2, 21, 2)],
+        "variants": [f"{var1}{var2}" for var1 in ["A", "B", "V", "G", "D"] for var2 in range(1, 5)],
+        "filename": "LS{level}{variant}-{labeler}-{algo}.csv",
+    },
+    "RT": {
+        "groups": ["RT"],
+        "levelNames": ["one", "two", "tree", "four", "five", "six", "seven", "eight", "niner", "ten"],
+        "levels": ["{:0>2d}".format(l) for l in range(2, 21, 2)],
+        "variants": ["{:0>2d}".format(v) for v in range(1, 21)],
+        "filename": "RT{level}-{variant}-{algo}.csv",
+    },
+}
+ALGORITHMS = ["DT", "KNN", "NB"]
+
+def read_accuracies(filename):
+    with open(filename) as file:
+        return np.array(file.readline().strip().split(','), dtype = float)
+
+def summarize_group(folder, family, group, algorithms = ALGORITHMS, workers = None):
+    '''Level name of every accuracy value and the (values x algorithms) accuracy matrix of one dataset group'''
+    config = FAMILIES[family]
+    labeler = group.split('-')[-1]
+    filenames = [config["filename"].format(level = level, variant = variant, labeler = labeler, algo = algo)
+                 for algo in algorithms for level in config["levels"] for variant in config["variants"]]
+    filesPerAlgo = len(filenames) // len(algorithms)
+
+    valuesPerFile = len(read_accuracies(os.path.join(folder, filenames[0])))
+    accuracies = np.empty((filesPerAlgo * valuesPerFile, len(algorithms)))
+
+    def fill(i):
+        values = read_accuracies(os.path.join(folder, filenames[i]))
+        if len(values) != valuesPerFile:
+            raise ValueError(f"{filenames[i]} has {len(values)} values, expected {valuesPerFile}. ")
+        row = (i % filesPerAlgo) * valuesPerFile
+        accuracies[row:row + valuesPerFile, i // filesPerAlgo] = values
+
+    with ThreadPoolExecutor(max_workers = workers) as executor:
+        list(executor.map(fill, range(len(filenames))))
+
+    levelHeaders = np.repeat(config["levelNames"], len(config["variants"]) * valuesPerFile)
+    return levelHeaders, accuracies
+
+def write_summary(filename, levelHeaders, accuracies, algorithms = ALGORITHMS):
+    if filename.endswith(".npz"):
+        np.savez(filename, levels = levelHeaders, algorithms = np.array(algorithms), accuracies = accuracies)
+        return
+    lines = [f"{level},{','.join(map(str, row))}\n" for level, row in zip(levelHeaders.tolist(), accuracies.tolist())]
+    with open(filename, 'w') as file:
+        file.write(''.join(lines))
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Summarise per-algorithm accuracy files into one file per dataset group. ")
+    parser.add_argument("--root", default = os.path.join("..", "Dataset", "artificial-new", "MetaLabels"),
+                        help = "folder holding the level1-CV-accy-<group> folders")
+    parser.add_argument("--family", action = "append", choices = list(FAMILIES), help = "dataset families to summarise, all by default")
+    parser.add_argument("--format", choices = ["csv", "npz"], default = "csv")
+    parser.add_argument("--workers", type = int, default = None, help = "number of reader threads")
+    args = parser.parse_args(argv)
+
+    for family in args.family or FAMILIES:
+        for datasetGrp in FAMILIES[family]["groups"]:
+            folder = os.path.join(args.root, f"level1-CV-accy-{datasetGrp}")
+            levelHeaders, accuracies = summarize_group(folder, family, datasetGrp, workers = args.workers)
+            write_summary(os.path.join(folder, f"{datasetGrp}-ACCY-SMRY.{args.format}"), levelHeaders, accuracies)
+            print(f"{datasetGrp} summarised: {accuracies.shape[0]} values")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import os
+import numpy as np
+from scipy import stats
+
+def split_accuracy_filename(filename):
+	'''"LS02A1-KNN-DT.csv" -> ("LS02A1-KNN", "DT"): the algorithm is the last dash-separated part of the name'''
+	dataset, _, algorithm = os.path.splitext(os.path.basename(filename))[0].rpartition("-")
+	return dataset, algorithm
+
+class AccuracyStore:
+	'''Fold accuracies keyed by dataset id and algorithm, kept in a growable NumPy structured array.
+
+	Every record holds the mean accuracy of each outer fold (the mean over its inner folds) and the overall mean.'''
+
+	def __init__(self, n_outer_folds=10, capacity=256):
+		self.dtype = np.dtype([("dataset", "U64"), ("algorithm", "U16"), ("fold_means", "f8", (n_outer_folds,)), ("mean", "f8")])
+		self.n_outer_folds = n_outer_folds
+		self.records = np.zeros(capacity, dtype=self.dtype)
+		self.size = 0
+		self.index = {}
+
+	def add(self, dataset, algorithm, accuracies):
+		#the fixed-width fields would silently cut longer ids, merging distinct datasets in arrays()
+		for field, value in (("dataset", dataset), ("algorithm", algorithm)):
+			width = self.dtype[field].itemsize // 4
+			if len(value) > width:
+				raise ValueError(f"{field} id {value} is longer than {width} characters. ")
+		accuracies = np.asarray(accuracies, dtype=float)
+		row = self.index.get((dataset, algorithm))
+		if row is None:
+			if self.size == len(self.records):
+				self.records = np.concatenate((self.records, np.zeros(len(self.records), dtype=self.dtype)))
+			row = self.index[(dataset, algorithm)] = self.size
+			self.size += 1
+		self.records[row] = (dataset, algorithm, accuracies.reshape(self.n_outer_folds, -1).mean(axis=1), accuracies.mean())
+
+	def ingest(self, filenames):
+		'''Add accuracy files one at a time; each holds a single row of inner fold accuracies, outer fold by outer fold'''
+		for filename in filenames:
+			with open(filename) as f:
+				accuracies = np.array(f.readline().strip().split(","), dtype=float)
+			self.add(*split_accuracy_filename(filename), accuracies)
+		return self
+
+	def arrays(self):
+		'''Dataset ids, algorithms, (datasets x algorithms x folds) fold means and (datasets x algorithms) means; nan where missing'''
+		records = self.records[:self.size]
+		datasets, dataset_rows = np.unique(records["dataset"], return_inverse=True)
+		algorithms, algorithm_cols = np.unique(records["algorithm"], return_inverse=True)
+		fold_means = np.full((len(datasets), len(algorithms), self.n_outer_folds), np.nan)
+		means = np.full((len(datasets), len(algorithms)), np.nan)
+		fold_means[dataset_rows, algorithm_cols] = records["fold_means"]
+		means[dataset_rows, algorithm_cols] = records["mean"]
+		return datasets, algorithms, fold_means, means
+
+def best_algorithm_labels(fold_means, means, alpha=0.05):
+	'''Label every algorithm of every dataset at once: 1 for the algorithm with the best mean accuracy and for every algorithm
+	   the best one is not significantly better than (t-test over the outer fold means), 0 otherwise'''
+	best = np.argmax(means, axis=1)
+	best_fold_means = np.broadcast_to(fold_means[np.arange(len(means)), best][:, None, :], fold_means.shape)
+	with np.errstate(divide="ignore", invalid="ignore"):
+		t, p = stats.ttest_ind(best_fold_means, fold_means, axis=2)
+	#a failed test (nan, e.g. identical constant accuracies) cannot reject the null hypothesis either
+	best_is_better = (p <= alpha) & (t > 0)
+	labels = np.where(best_is_better, 0, 1)
+	labels[np.arange(len(means)), best] = 1
+	return labels
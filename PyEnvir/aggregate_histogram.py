@@ -1,42 +1,79 @@
+import os, argparse, matplotlib
+matplotlib.use("Agg")
 import numpy as np
-import matplotlib.pyplot as plt 
-import os, csv, matplotlib, math
-
-def GetFilenamesStartWith(paths, prefix):
-    filenames = []
-    for path in paths:
-        if os.path.basename(path).startswith(prefix):
-            filenames.append(path)
-    return filenames
+import matplotlib.pyplot as plt
 
 matplotlib.rcParams.update({'font.size': 7})
 colIndexes = { "origAlpha": 3, "knnAlpha": 6, "knnAShift": 7, "nbAlpha": 10, "nbAShift": 11, "dtAlpha": 14, "dtAShift": 15}
-for datasetType in ["LS-DT", "LS-KNN", "LS-NB", "RT"]:
-    datasetFolder = f"..\\Dataset\\artificial-new\\level1\\level1-summary\\{datasetType}"
-    os.chdir(datasetFolder)
-    smryFilenames = os.listdir(datasetFolder)
-    for figCat in colIndexes:
-        title = f"{datasetType}.{figCat}"
-        plt.suptitle(title, y = 0.94, fontsize = 15)
-        #intervalMinVals = [0.05 * i for i in range(21)] if figCat.endswith("Alpha") else [(0.1 * i) - 1 for i in range(21)]
-        for l in range(2, 21, 2):
-            level = "{:0>2d}".format(l)
-            targetFilenames = GetFilenamesStartWith(smryFilenames, f"{datasetType[:2]}{level}")
-            figValueCollection = []
-            for filename in targetFilenames:
-                with open(filename) as file:
-                    rows = list(file)
-                    for row in rows[1:]:
-                        value = float(row.split(',')[colIndexes[figCat]])
-                        figValueCollection.append(math.exp(value))
-            figValueCollection = np.array(figValueCollection).astype(np.float)
-            plt.gca().axes.get_yaxis().set_ticks([])
-            plt.subplot(3, 4, l / 2)
-            #plt.hist(figValueCollection, bins = intervalMinVals)
-            plt.hist(figValueCollection, bins = 20)
-            plt.title(f"  {level}", loc = "left", pad = -13)
-        plt.gca().axes.get_yaxis().set_ticks([])
-        plt.gcf().set_size_inches(11.7, 8.3)
-        plt.savefig(f"..\\Dataset\\artificial-new\\level1\\level1-summary\\AggregateHistogram-unfixedbin\\exponential\\{title}.png", dpi = 300)
-        print(f"{title} saved. ")
-        plt.clf()
+datasetTypes = ["LS-DT", "LS-KNN", "LS-NB", "RT"]
+levels = ["{:0>2d}".format(l) for l in range(2, 21, 2)]
+binCount = 20
+
+class HistogramAccumulator:
+    '''Fixed-bin counts of the colIndexes columns per (datasetType, level), updated one summary file at a time.
+
+    Alphas lie in [0, 1] and alpha shifts in [-1, 1]; both are split into binCount equal bins. As exp is monotonic,
+    the same counts are the histogram on the exponential scale with exp applied to the bin edges, so one pass
+    serves both scales and memory stays constant whatever the size of the corpus.'''
+
+    def __init__(self):
+        self.edges = np.array([np.linspace(0, 1, binCount + 1) if figCat.endswith("Alpha") else np.linspace(-1, 1, binCount + 1)
+                               for figCat in colIndexes])
+        self.counts = {}
+        self.outOfRange = 0
+
+    def update(self, key, values):
+        '''values: rows x len(colIndexes) array of one summary file'''
+        low, high = self.edges[:, 0], self.edges[:, -1]
+        bins = np.floor((values - low) / (high - low) * binCount).astype(np.int64)
+        bins[values == high] = binCount - 1
+        inRange = (bins >= 0) & (bins < binCount)
+        self.outOfRange += np.count_nonzero(~inRange)
+        codes = (bins + binCount * np.arange(len(colIndexes)))[inRange]
+        counts = np.bincount(codes, minlength = binCount * len(colIndexes)).reshape(len(colIndexes), binCount)
+        self.counts[key] = self.counts.get(key, 0) + counts
+
+def Accumulate(summaryFolder):
+    accumulator = HistogramAccumulator()
+    for datasetType in datasetTypes:
+        datasetFolder = os.path.join(summaryFolder, datasetType)
+        for filename in os.listdir(datasetFolder):
+            level = filename[2:4]
+            if filename.startswith(datasetType[:2]) and level in levels:
+                values = np.loadtxt(os.path.join(datasetFolder, filename), delimiter = ",", skiprows = 1,
+                                    usecols = list(colIndexes.values()), ndmin = 2)
+                accumulator.update((datasetType, level), values)
+    return accumulator
+
+def Plot(accumulator, outputFolder, scale):
+    os.makedirs(outputFolder, exist_ok = True)
+    for datasetType in datasetTypes:
+        for c, figCat in enumerate(colIndexes):
+            title = f"{datasetType}.{figCat}"
+            edges = np.exp(accumulator.edges[c]) if scale == "exponential" else accumulator.edges[c]
+            fig = plt.figure(figsize = (11.7, 8.3))
+            fig.suptitle(title, y = 0.94, fontsize = 15)
+            for i, level in enumerate(levels, 1):
+                ax = fig.add_subplot(3, 4, i)
+                counts = accumulator.counts.get((datasetType, level))
+                if counts is not None:
+                    ax.stairs(counts[c], edges, fill = True)
+                ax.set_title(f"  {level}", loc = "left", pad = -13)
+                ax.get_yaxis().set_ticks([])
+            fig.savefig(os.path.join(outputFolder, f"{title}.png"), dpi = 300)
+            plt.close(fig)
+            print(f"{title} ({scale}) saved. ")
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Draw per-level aggregate histograms of the level 1 summary columns. ")
+    parser.add_argument("--summary-folder", default = os.path.join("..", "Dataset", "artificial-new", "level1", "level1-summary"))
+    args = parser.parse_args(argv)
+
+    accumulator = Accumulate(args.summary_folder)
+    if accumulator.outOfRange:
+        print(f"{accumulator.outOfRange} values fell outside the fixed bins and were left out. ")
+    for scale in ["raw", "exponential"]:
+        Plot(accumulator, os.path.join(args.summary_folder, "AggregateHistogram-fixedbin", scale), scale)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+'''Per-instance alpha values, the Python counterpart of KNNContext.GetAllAlphaValues in MLCore.
+
+The alpha of an instance with label c is the share of its homo_c - 1 nearest other instances that also carry label c,
+divided by homo_c, the number of instances labeled c. Neighbours are ordered by Euclidean distance and, as with the
+stable OrderBy in MLCore, ties are broken by row order, so the values match the C# output exactly.
+'''
+
+import os, argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataset_cache import load_dataset
+
+def alpha_values(X, y, chunk_size = 1 << 24):
+    '''Alpha of every row of X (features) given labels y.
+
+    The instances of each class are compared with all instances in batches, by brute force: an exact alpha needs
+    homo_c - 1 neighbours, a large share of the dataset, so a spatial index cannot prune and the cost is inherently
+    O(n * homo_c) distance evaluations. Per row, np.partition finds the distance of the (homo_c - 1)-th neighbour;
+    neighbours strictly closer are all taken and the ones at exactly that distance are taken in row order.
+    chunk_size bounds the number of coordinate differences held in memory at once.'''
+    X = np.asarray(X, dtype = float)
+    y = np.asarray(y)
+    n, d = X.shape
+    alphas = np.zeros(n)
+    batch_size = max(1, chunk_size // max(1, n * d))
+
+    for label in np.unique(y):
+        members = np.flatnonzero(y == label)
+        homo_count = len(members)
+        k = homo_count - 1
+        if k == 0:
+            continue
+        is_same = y == label
+
+        for start in range(0, homo_count, batch_size):
+            query = members[start:start + batch_size]
+            # distances computed as MLCore does (square root taken, so that nearly equal squares tie as they do there)
+            dist = np.sqrt(((X[None, :, :] - X[query][:, None, :]) ** 2).sum(axis = 2))
+            dist[np.arange(len(query)), query] = np.inf
+            cutoff = np.partition(dist, k - 1, axis = 1)[:, k - 1:k]
+
+            closer = dist < cutoff
+            ring = dist == cutoff
+            needed = k - np.count_nonzero(closer, axis = 1)
+            taken = closer | (ring & (np.cumsum(ring, axis = 1) <= needed[:, None]))
+            alphas[query] = np.count_nonzero(taken & is_same, axis = 1) / homo_count
+
+    return alphas
+
+def write_dataset_with_alpha(filename, X, y, alphas):
+    '''Write features, label and alpha with the header MLCore's AlphaTasks uses'''
+    header = ','.join([f'feature{i}' for i in range(X.shape[1])] + ['label', 'alpha'])
+    rows = [','.join(map(str, row)) for row in np.column_stack((X, y, alphas)).tolist()]
+    with open(filename, 'w') as file:
+        file.write(header + '\n' + '\n'.join(rows) + '\n')
+
+def process_file(filename, output_folder):
+    dataset = load_dataset(filename, False)
+    X, y = np.asarray(dataset.features), np.asarray(dataset.labels)
+    alphas = alpha_values(X, y)
+    write_dataset_with_alpha(os.path.join(output_folder, os.path.splitext(os.path.basename(filename))[0] + '.csv'), X, y, alphas)
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = 'Compute per-instance alpha values for every dataset in a folder. ')
+    parser.add_argument('dataset_folder')
+    parser.add_argument('output_folder')
+    parser.add_argument('--workers', type = int, default = None, help = 'number of worker processes')
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output_folder, exist_ok = True)
+    filenames = [os.path.join(args.dataset_folder, filename) for filename in os.listdir(args.dataset_folder)]
+    finishedCount = 0
+    with ProcessPoolExecutor(max_workers = args.workers) as executor:
+        futures = { executor.submit(process_file, filename, args.output_folder): filename for filename in filenames }
+        for future in as_completed(futures):
+            try:
+                future.result()
+                finishedCount += 1
+                print(f'Successfully finished {futures[future]} (Total: {finishedCount})')
+            except Exception as e:
+                print(f'{type(e).__name__} encountered in processing {futures[future]}, skipping this file: {e}')
+
+if __name__ == '__main__':
+    main()
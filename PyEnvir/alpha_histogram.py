@@ -1,6 +1,6 @@
-import numpy as np
 import matplotlib.pyplot as plt 
-import os, csv, matplotlib
+import os, matplotlib
+from dataset_cache import load_dataset
 
 datasetPath = "..\\Dataset\\artificial-R\\dataset"
 figurePath = "..\\Dataset\\artificial-R\\base alpha histogram"
@@ -14,11 +14,7 @@ intervalMinVals = [0.05 * i for i in range(0, 21)]
 matplotlib.rcParams.update({'font.size': 7})
 
 for filename in filenames: 
-    table = []
-    with open(filename) as file: 
-        table = [row for row in csv.reader(file)][1:] 
-    alphas = [table[r][-1] for r in range(len(table))]
-    alphas = np.array(alphas).astype(np.float)
+    alphas = load_dataset(filename, True).alphas
     
     plt.gca().axes.get_yaxis().set_ticks([])
     plt.hist(alphas, bins = intervalMinVals)
@@ -0,0 +1,79 @@
+'''Incremental per-file summary of alpha columns: bin frequencies plus min/max/mean/median/std.
+
+Summaries are kept in a CSV store keyed by file path, with the size, mtime and sha1 of the file content (as recorded
+by dataset_cache). Files whose size and mtime match their row are skipped without being opened; the others are read
+through the cache and only re-summarised when their content actually changed.
+'''
+
+import os, csv
+import numpy as np
+from dataset_cache import load_dataset
+
+N_BINS = 10
+STAT_NAMES = ["min", "max", "mean", "median", "std"]
+COLUMNS = ["path", "sha1", "size", "mtime_ns", "count"] + [f"bin{i}" for i in range(N_BINS)] + STAT_NAMES
+
+def bin_frequencies(alphas, n_bins = N_BINS):
+    '''Share of alphas in each of n_bins equal bins over [0, 1]; alpha = 1 belongs to the last bin'''
+    bins = np.minimum((np.asarray(alphas) * n_bins).astype(np.int64), n_bins - 1)
+    return np.bincount(bins, minlength = n_bins) / len(alphas)
+
+def alpha_statistics(alphas):
+    alphas = np.asarray(alphas)
+    mean = alphas.mean()
+    return [alphas.min(), alphas.max(), mean, np.median(alphas), np.sqrt(np.mean((alphas - mean) ** 2))]
+
+class AlphaSummaryStore:
+    '''Rows of [sha1, size, mtime_ns, count, bin frequencies..., statistics...] by absolute path'''
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.rows = {}
+        if os.path.exists(filename):
+            with open(filename, newline = '') as file:
+                for record in csv.DictReader(file):
+                    # stores written before size and mtime were kept fall back to the content hash
+                    self.rows[record["path"]] = [record["sha1"], int(record.get("size", -1)), int(record.get("mtime_ns", -1)),
+                                                 int(record["count"])] + [float(record[column]) for column in COLUMNS[5:]]
+
+    def update(self, filenames):
+        '''Summarise the files that are not in the store yet or whose content changed; returns their paths'''
+        updated = []
+        for filename in filenames:
+            path = os.path.abspath(filename)
+            stat = os.stat(path)
+            row = self.rows.get(path)
+            if row is not None and row[1:3] == [stat.st_size, stat.st_mtime_ns]:
+                continue
+            dataset = load_dataset(path, True)
+            if row is not None and row[0] == dataset.source_hash:
+                row[1:3] = [stat.st_size, stat.st_mtime_ns]
+                continue
+            alphas = np.asarray(dataset.alphas)
+            self.rows[path] = [dataset.source_hash, stat.st_size, stat.st_mtime_ns, len(alphas)] + \
+                              list(bin_frequencies(alphas)) + alpha_statistics(alphas)
+            updated.append(path)
+        return updated
+
+    def save(self):
+        with open(self.filename + ".tmp", 'w', newline = '') as file:
+            writer = csv.writer(file, lineterminator = '\n')
+            writer.writerow(COLUMNS)
+            writer.writerows([path] + row for path, row in self.rows.items())
+        os.replace(self.filename + ".tmp", self.filename)
+
+    def bin_frequencies(self, filename):
+        return self.rows[os.path.abspath(filename)][4:4 + N_BINS]
+
+    def statistics(self, filename):
+        '''min, max, mean, median and (population) std of the alphas of one file'''
+        return dict(zip(STAT_NAMES, self.rows[os.path.abspath(filename)][4 + N_BINS:]))
+
+def summarize_folder(folder, store_filename):
+    '''Bring the store up to date with every file of a folder; returns the store and the files of the folder'''
+    filenames = [os.path.join(folder, filename) for filename in os.listdir(folder)]
+    store = AlphaSummaryStore(store_filename)
+    updated = store.update(filenames)
+    store.save()
+    print(f"{len(updated)} of {len(filenames)} files summarised, the rest unchanged")
+    return store, filenames
@@ -1,147 +1,82 @@
-debug = False 
-
-import os, csv, random 
-from sklearn.neighbors import KNeighborsClassifier 
+import os, argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from grid_generation import generate_sections
+from sklearn.neighbors import KNeighborsClassifier
 from sklearn.tree import DecisionTreeClassifier
-from sklearn.naive_bayes import GaussianNB 
-
-home = os.getcwd() 
-dataset_path = os.path.join(home, "datasets") 
-if not os.path.exists(dataset_path): 
-	os.mkdir(dataset_path) 
-os.chdir(dataset_path)
-
-def get_dist(a, b): 
-	#for instance i, its position is (i//25*1/24, i%25*1/24) 
-	x_a = (a//25) * (1/24) 
-	y_a = (a%25) * (1/24) 
-	x_b = (b//25) * (1/24) 
-	y_b = (b%25) * (1/24) 
-	return pow(x_a-x_b, 2) + pow(y_a-y_b, 2)  
-
-def get_min(l): 
-	if len(l) <2: 
-		return l 
-	else: 
-		less = [] 
-		more = [] 
-		pivot = l[0] 
-		for i in range(1, len(l)): 
-			if l[i][1] <= pivot[1]: 
-				less.append(l[i]) 
-			else: 
-				more.append(l[i]) 
-	return get_min(less) + [pivot] + get_min(more) 
-
-#define the complexity k, range from 1 to 9
-for k in range(1, 10): 
-	print("k", k)
-	#each complexity level would have 10 datasets 
-	for n_dataset in range(10): 
-		print("n_dataset", n_dataset)
-		#define the dataset
-		dataset_x = [[(i//25)*(1/24), (i%25)*(1/24)] for i in range(25*25)] 
-		dataset_y = [None for i in range(25*25)]
-
-		#divide the grid into 2^k subsections 
-		sections = [[] for i in range(pow(2,k))] 
-		num = [i for i in range(25*25)] 
-		random.shuffle(num) 
-		j = 0
-		for i in range(25*25): 
-			sections[j].append(num[i])
-			if j == (pow(2,k)-1): 
-				j = 0 
-			else: 
-				j += 1 
-
-		#generate the centroid points 
-		centroids = [] 
-		for section in sections: 
-			#for instance i, its position is (i//25*1/24, i%25*1/24) 
-			dis = [] 
-			for instance in section: 
-				dis_temp = 0 
-				for point in section: 
-					if instance != point: 
-						dis_temp += get_dist(point, instance) 
-				dis.append([instance, dis_temp]) 
-			min_dis = get_min(dis) 
-			centroids.append(min_dis[0][0])  
-
-		if debug: 
-			print(centroids) 
-
-		#give each centroid point a random label 
-		for centroid in centroids: 
-			dataset_y[centroid] = random.choice([0,1]) 
-
-		#use 3 different algorithms to build the model and assign labels to instances based on the models 
-		#generate the training set and testing set 
-		test_x = [] 
-		test_y = [] 
-		train_x = [] 
-		train_y = [] 
-		for centroid in centroids: 
-			train_x.append(dataset_x[centroid]) 
-			train_y.append(dataset_y[centroid]) 
-		for i in range(25*25): 
-			if i not in centroids: 
-				test_x.append(dataset_x[i]) 
-
-		#knn 
-		classifier = KNeighborsClassifier(n_neighbors=int(pow(pow(2,k), 0.5))) 
-		classifier.fit(train_x, train_y) 
-		test_y = classifier.predict(test_x) 
-
-		dataset_name = str((k-1)*10+n_dataset) + "_knn.csv" 
-		with open(dataset_name, "w", newline="") as f: 
-			writer = csv.writer(f) 
-			temp = [] 
-			for i in range(len(train_x)): 
-				row = train_x[i][:] 
-				row.append(train_y[i]) 
-				temp.append(row) 
-			for i in range(len(test_x)): 
-				row = test_x[i][:] 
-				row.append(test_y[i]) 
-				temp.append(row)
-			writer.writerows(temp) 
-
-		#decision tree 
-		classifier = DecisionTreeClassifier()
-		classifier.fit(train_x, train_y) 
-		test_y = classifier.predict(test_x) 
-
-		dataset_name = str((k-1)*10+n_dataset) + "_dt.csv" 
-		with open(dataset_name, "w", newline="") as f: 
-			writer = csv.writer(f) 
-			temp = [] 
-			for i in range(len(train_x)): 
-				row = train_x[i][:] 
-				row.append(train_y[i]) 
-				temp.append(row) 
-			for i in range(len(test_x)): 
-				row = test_x[i][:] 
-				row.append(test_y[i]) 
-				temp.append(row) 
-			writer.writerows(temp) 
-
-		#naive bayes 
-		classifier = GaussianNB()
-		classifier.fit(train_x, train_y) 
-		test_y = classifier.predict(test_x) 
-
-		dataset_name = str((k-1)*10+n_dataset) + "_nb.csv" 
-		with open(dataset_name, "w", newline="") as f: 
-			writer = csv.writer(f) 
-			temp = [] 
-			for i in range(len(train_x)): 
-				row = train_x[i][:] 
-				row.append(train_y[i]) 
-				temp.append(row) 
-			for i in range(len(test_x)): 
-				row = test_x[i][:] 
-				row.append(test_y[i]) 
-				temp.append(row) 
-			writer.writerows(temp) 
+from sklearn.naive_bayes import GaussianNB
+
+#labelers used to assign labels to the grid, by the suffix of the dataset file they produce;
+#extra keyword arguments override the estimator's parameters
+LABELERS = {
+	"knn": lambda k, random_state, **params: KNeighborsClassifier(**{"n_neighbors": int(pow(pow(2,k), 0.5)), **params}),
+	"dt": lambda k, random_state, **params: DecisionTreeClassifier(**{"random_state": random_state, **params}),
+	"nb": lambda k, random_state, **params: GaussianNB(**params),
+}
+
+def dataset_seed(seed, k, n_dataset):
+	'''Seed of one dataset, derived from the run seed and its position only, so results do not depend on scheduling'''
+	return np.random.SeedSequence(seed, spawn_key=(k, n_dataset))
+
+def generate_features(k, seed_seq, grid_size=25):
+	'''The feature matrix shared by all label variants (the 2^k centroids first, then the other cells in grid order)
+	   and the random labels of the centroids'''
+	rng = np.random.default_rng(seed_seq)
+	#divide the grid into 2^k subsections and find the centroid point of each
+	points, centroids, is_centroid = generate_sections(grid_size, k, rng)
+	#give each centroid point a random label
+	centroid_labels = rng.integers(0, 2, size=len(centroids))
+	features = np.concatenate((points[centroids], points[~is_centroid]))
+	return features, centroid_labels
+
+def label_dataset(features, centroid_labels, labeler, k, seed_seq, labeler_params=None):
+	'''Fit a labeler on the centroids and label every other cell of the grid with a single predict call'''
+	n_train = len(centroid_labels)
+	random_state = int(seed_seq.generate_state(1)[0])
+	classifier = LABELERS[labeler](k, random_state, **(labeler_params or {}))
+	classifier.fit(features[:n_train], centroid_labels)
+	labels = classifier.predict(features)
+	labels[:n_train] = centroid_labels
+	return labels
+
+def write_dataset(filename, features, labels):
+	#floats are written in their shortest round-trip form, as csv.writer did
+	rows = [",".join(map(str, row)) + f",{label}\n" for row, label in zip(features.tolist(), labels.tolist())]
+	with open(filename, "w") as f:
+		f.writelines(rows)
+
+def generate_dataset(output_path, k, n_dataset, seed, datasets_per_level=10, grid_size=25, labelers=tuple(LABELERS)):
+	'''Generate the grid of one dataset and write one labeled copy of it per labeler; returns the filenames'''
+	seed_seq = dataset_seed(seed, k, n_dataset)
+	features, centroid_labels = generate_features(k, seed_seq, grid_size)
+	filenames = []
+	for labeler in labelers:
+		labels = label_dataset(features, centroid_labels, labeler, k, seed_seq)
+		filename = os.path.join(output_path, str((k-1)*datasets_per_level+n_dataset) + f"_{labeler}.csv")
+		write_dataset(filename, features, labels)
+		filenames.append(filename)
+	return filenames
+
+def generate_all(output_path, seed, max_k=9, datasets_per_level=10, grid_size=25, workers=None):
+	'''Generate datasets_per_level datasets for every complexity k from 1 to max_k over a pool of worker processes'''
+	os.makedirs(output_path, exist_ok=True)
+	jobs = [(k, n_dataset) for k in range(1, max_k + 1) for n_dataset in range(datasets_per_level)]
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		futures = [executor.submit(generate_dataset, output_path, k, n_dataset, seed, datasets_per_level, grid_size) for k, n_dataset in jobs]
+		for (k, n_dataset), future in zip(jobs, futures):
+			future.result()
+			print("k", k, "n_dataset", n_dataset)
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Generate artificial grid datasets labeled by KNN, DT and NB. ")
+	parser.add_argument("--output", default=os.path.join(os.getcwd(), "datasets"), help="folder to write the datasets to")
+	parser.add_argument("--seed", type=int, required=True, help="run seed, every dataset derives its own seed from it")
+	parser.add_argument("--max-k", type=int, default=9, help="datasets are generated for complexity 1 to max-k, i.e. up to 2^max-k sections")
+	parser.add_argument("--datasets-per-level", type=int, default=10)
+	parser.add_argument("--grid-size", type=int, default=25)
+	parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+	args = parser.parse_args(argv)
+	generate_all(args.output, args.seed, args.max_k, args.datasets_per_level, args.grid_size, args.workers)
+
+if __name__ == "__main__":
+	main()
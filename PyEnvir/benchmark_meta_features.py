@@ -0,0 +1,125 @@
+'''Benchmark of the conventional meta-feature extractors over a grid of synthetic dataset shapes.
+
+Every extractor is timed on its own, with warm-up runs before the timed repeats, and its peak traced allocation is
+measured in a separate run so that tracing does not slow down the timings. Results are saved as JSON; given a
+baseline saved by an earlier run, cases whose median time or peak memory grew beyond the tolerance are reported
+and the run exits with status 1.
+'''
+
+import json, time, platform, argparse, itertools, tracemalloc
+import numpy as np
+import sklearn
+from conventional_meta_feature_generation import filter_attribute, infoMetas, statMetas, decisionTreeMetas
+
+EXTRACTORS = {
+    'filter_attribute': lambda dataset: filter_attribute(dataset[:, :-1]),
+    'infoMetas': infoMetas,
+    'statMetas': statMetas,
+    'decisionTreeMetas': decisionTreeMetas,
+}
+
+def synthetic_dataset(rows, cols, binary_fraction, n_classes, seed = 0):
+    '''rows x (cols + 1) dataset: the first binary_fraction of the columns binary, the rest normal, then a class
+       label that depends on the first column so that trees have structure to find'''
+    rng = np.random.default_rng(seed)
+    n_binary = int(round(cols * binary_fraction))
+    dataset = np.empty((rows, cols + 1))
+    dataset[:, :n_binary] = rng.integers(0, 2, size = (rows, n_binary))
+    dataset[:, n_binary:cols] = rng.standard_normal(size = (rows, cols - n_binary))
+    signal = dataset[:, 0] + rng.standard_normal(rows)
+    dataset[:, cols] = np.digitize(signal, np.quantile(signal, np.linspace(0, 1, n_classes + 1)[1:-1]))
+    return dataset
+
+def case_name(rows, cols, binary_fraction, n_classes):
+    return f'r{rows}-c{cols}-b{binary_fraction:g}-k{n_classes}'
+
+def time_extractor(extractor, dataset, repeat = 5, warmup = 1):
+    for _ in range(warmup):
+        extractor(dataset)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extractor(dataset)
+        times.append(time.perf_counter() - start)
+    return times
+
+def peak_memory(extractor, dataset):
+    '''Peak of the memory traced by tracemalloc during one run, in bytes (numpy buffers included)'''
+    tracemalloc.start()
+    try:
+        extractor(dataset)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_benchmark(rows, cols, binary_fractions, classes, extractors = tuple(EXTRACTORS), repeat = 5, warmup = 1, max_cells = 5 * 10 ** 7):
+    '''One result per (case, extractor); cases with more than max_cells values are skipped'''
+    results = []
+    for n_rows, n_cols, binary_fraction, n_classes in itertools.product(rows, cols, binary_fractions, classes):
+        if n_rows * n_cols > max_cells:
+            continue
+        case = case_name(n_rows, n_cols, binary_fraction, n_classes)
+        dataset = synthetic_dataset(n_rows, n_cols, binary_fraction, n_classes)
+        for name in extractors:
+            try:
+                times = time_extractor(EXTRACTORS[name], dataset, repeat, warmup)
+                peak = peak_memory(EXTRACTORS[name], dataset)
+            except Exception as e:
+                print(f'{case}\t{name}\t{type(e).__name__}: {e}')
+                continue
+            results.append({ 'case': case, 'extractor': name, 'rows': n_rows, 'cols': n_cols, 'binary_fraction': binary_fraction,
+                             'classes': n_classes, 'repeat': repeat, 'min': min(times), 'median': float(np.median(times)),
+                             'mean': float(np.mean(times)), 'peak_bytes': peak })
+            print(f'{case}\t{name}\t{np.median(times):.6f}s\t{peak / 2 ** 20:.1f}MiB')
+    return results
+
+def environment():
+    return { 'python': platform.python_version(), 'numpy': np.__version__, 'sklearn': sklearn.__version__,
+             'machine': platform.machine(), 'processor': platform.processor() }
+
+def compare(results, baseline, tolerance = 0.2, memory_tolerance = 0.1):
+    '''Lines describing the (case, extractor) pairs slower or larger than in the baseline beyond the tolerances'''
+    previous = { (result['case'], result['extractor']): result for result in baseline['results'] }
+    regressions = []
+    for result in results:
+        old = previous.get((result['case'], result['extractor']))
+        if old is None:
+            continue
+        time_ratio = result['median'] / old['median'] if old['median'] > 0 else 1.0
+        memory_ratio = result['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] > 0 else 1.0
+        if time_ratio > 1 + tolerance or memory_ratio > 1 + memory_tolerance:
+            regressions.append(f"{result['case']}\t{result['extractor']}\ttime x{time_ratio:.2f}\tmemory x{memory_ratio:.2f}")
+    return regressions
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = 'Benchmark the meta-feature extractors over synthetic dataset shapes. ')
+    parser.add_argument('--rows', type = int, nargs = '+', default = [1000, 10000, 100000, 1000000])
+    parser.add_argument('--cols', type = int, nargs = '+', default = [2, 10, 100, 1000])
+    parser.add_argument('--binary-fraction', type = float, nargs = '+', default = [0.0, 0.5], help = 'share of binary columns')
+    parser.add_argument('--classes', type = int, nargs = '+', default = [2, 10])
+    parser.add_argument('--extractor', action = 'append', choices = list(EXTRACTORS), help = 'extractors to time, all by default')
+    parser.add_argument('--repeat', type = int, default = 5)
+    parser.add_argument('--warmup', type = int, default = 1)
+    parser.add_argument('--max-cells', type = int, default = 5 * 10 ** 7, help = 'skip shapes with more rows x cols than this')
+    parser.add_argument('--output', default = 'benchmark_meta_features.json')
+    parser.add_argument('--baseline', help = 'results of an earlier run to compare against')
+    parser.add_argument('--tolerance', type = float, default = 0.2, help = 'allowed relative growth of the median time')
+    parser.add_argument('--memory-tolerance', type = float, default = 0.1, help = 'allowed relative growth of the peak memory')
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.rows, args.cols, args.binary_fraction, args.classes, tuple(args.extractor or EXTRACTORS),
+                            args.repeat, args.warmup, args.max_cells)
+    with open(args.output, 'w') as file:
+        json.dump({ 'environment': environment(), 'results': results }, file, indent = 1)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance, args.memory_tolerance)
+        print(f'{len(regressions)} regressions against {args.baseline}')
+        for line in regressions:
+            print(line)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,20 +1,18 @@
 import os
+from dataset_profiler import profile_folder
 
 datasetPath = "..\\Dataset\\artificial-new\\level0\\rebalanced\\R14"
-filenames = [os.path.join(datasetPath, filename) for filename in os.listdir(datasetPath)]
 
-stats = ["filename,#pos,%pos,#neg,%neg,CBR,count,NIR"]
-for filename in filenames:
-    rows = []
-    count = -1
-    with open(filename) as file:
-        rows = list(file)
-        count = len(rows)
-    labels = [float(row.split(',')[2]) for row in rows]
-    pos = labels.count(1.0)
-    neg = labels.count(0.0)
-    cbr = pos / neg if pos < neg else neg / pos
-    stats.append(f"{os.path.basename(filename).split('.')[0]},{pos},{pos / count},{neg},{neg / count},{cbr},{count},{count / 2500}")
+if __name__ == "__main__":
+    stats = ["filename,#pos,%pos,#neg,%neg,CBR,count,NIR"]
+    # the label of these datasets is the third column, whatever follows it
+    for profile in profile_folder(datasetPath, label_column = 2):
+        count = profile.row_count
+        pos = profile.label_counts.get("1", 0)
+        neg = profile.label_counts.get("0", 0)
+        cbr = pos / neg if pos < neg else neg / pos
+        # this column has always been the instance count relative to the 2500 points of a full grid
+        stats.append(f"{os.path.basename(profile.filename).split('.')[0]},{pos},{pos / count},{neg},{neg / count},{cbr},{count},{count / 2500}")
 
-with open("class_balance_r14.csv", 'w') as file:
-    file.write('\n'.join(stats))
+    with open("class_balance_r14.csv", 'w') as file:
+        file.write('\n'.join(stats))
@@ -1,62 +1,83 @@
+import os, argparse, matplotlib
+matplotlib.use("Agg")
 import numpy as np
-import matplotlib.pyplot as plt 
-import os, csv, matplotlib, math
+import matplotlib.pyplot as plt
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 matplotlib.rcParams.update({'font.size': 7})
 graphTypes = { "origAlpha": 3, "knnAlpha": 6, "knnAShift": 7, "nbAlpha": 10, "nbAShift": 11, "dtAlpha": 14, "dtAShift": 15 }
 transformations = ["original", "root", "logarithm", "exponential", "inverse"]
 datasetTypes = ["LS-DT", "LS-KNN", "LS-NB", "RT"]
-subplotIndex = 1
+plotsPerPage = 20
 
-def FilterFilenamesStartWith(filenames, prefix):
-    results = []
-    for path in filenames:
-        if os.path.basename(path).startswith(prefix):
-            results.append(path)
-    return results
+def LoadSummaryTable(summaryFolder):
+    '''Read every level1-summary file once; returns (title, mtime, values) per file, values holding the graphTypes columns'''
+    table = []
+    for datasetType in datasetTypes:
+        folder = os.path.join(summaryFolder, datasetType)
+        for filename in os.listdir(folder):
+            path = os.path.join(folder, filename)
+            values = np.loadtxt(path, delimiter = ",", skiprows = 1, usecols = list(graphTypes.values()), ndmin = 2)
+            table.append((filename[:-9], os.path.getmtime(path), values))
+    return table
 
-def TransformValue(value, mode):
-    if mode == "original":
-        return value
-    if mode == "root":
-        return value ** 0.5
-    if mode == "logarithm":
-        return None if value == 0 else math.log(abs(value))
-    if mode == "exponential":
-        return math.exp(value)
-    if mode == "inverse":
-        return None if value == 0 else 1 / value
+def TransformValues(values, mode):
+    '''Apply a transformation to a whole column at once, dropping values it is undefined for'''
+    with np.errstate(divide = "ignore", invalid = "ignore", over = "ignore"):
+        if mode == "original":
+            transformed = values
+        elif mode == "root":
+            transformed = np.sqrt(values)
+        elif mode == "logarithm":
+            transformed = np.log(np.abs(values))
+        elif mode == "exponential":
+            transformed = np.exp(values)
+        elif mode == "inverse":
+            transformed = 1 / values
+    return transformed[np.isfinite(transformed)]
 
-for graphType in graphTypes:
-    for transformation in transformations:
-        os.makedirs(f"..\\Dataset\\artificial-new\\level1\\level1-summary\\CategorizedHistogram-unfixedbin\\{graphType}\\{transformation}")
-        plotIndex = 1
-        # draw 800 histograms
-        for datasetType in datasetTypes:
-            for filename in os.listdir(f"..\\Dataset\\artificial-new\\level1\\level1-summary\\{datasetType}"):
-                filename = f"..\\Dataset\\artificial-new\\level1\\level1-summary\\{datasetType}\\" + filename
-                rows = []
-                with open(filename) as file:
-                    rows = list(file)
-                valueCollection = []
-                for row in rows[1:]:
-                    value = float(row.split(',')[graphTypes[graphType]])
-                    valueTransformed = TransformValue(value, transformation)
-                    if valueTransformed is not None:
-                        valueCollection.append(valueTransformed)
-                valueCollection = np.array(valueCollection).astype(np.float)
-                plt.gca().axes.get_yaxis().set_ticks([])
-                plt.subplot(5, 4, subplotIndex)
-                subplotIndex += 1
-                plt.hist(valueCollection, bins = 20)
-                plt.title(os.path.basename(filename)[:-9], loc = "left", pad = -13)
-                if subplotIndex > 20:
-                    graphName = f"{graphType}-{transformation}-{plotIndex}"
-                    plt.suptitle(graphName, y = 0.94, fontsize = 15)
-                    plt.gca().axes.get_yaxis().set_ticks([])
-                    plt.gcf().set_size_inches(9, 8.3)
-                    plt.savefig(f"..\\Dataset\\artificial-new\\level1\\level1-summary\\CategorizedHistogram-unfixedbin\\{graphType}\\{transformation}\\{graphName}.png", dpi = 300)
-                    print(f"{graphName} saved. ")
-                    plt.clf()
-                    subplotIndex = 1
-                    plotIndex += 1
+def RenderPage(figurePath, graphName, panels):
+    fig = plt.figure(figsize = (9, 8.3))
+    for subplotIndex, (title, values) in enumerate(panels, 1):
+        ax = fig.add_subplot(5, 4, subplotIndex)
+        ax.hist(values, bins = 20)
+        ax.set_title(title, loc = "left", pad = -13)
+        ax.get_yaxis().set_ticks([])
+    fig.suptitle(graphName, y = 0.94, fontsize = 15)
+    fig.savefig(figurePath, dpi = 300)
+    plt.close(fig)
+    return graphName
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Draw categorized histograms of the level 1 summary columns. ")
+    parser.add_argument("--summary-folder", default = os.path.join("..", "Dataset", "artificial-new", "level1", "level1-summary"))
+    parser.add_argument("--workers", type = int, default = None, help = "number of rendering processes")
+    parser.add_argument("--skip-up-to-date", action = "store_true", help = "skip pages whose PNG is newer than all of its input files")
+    args = parser.parse_args(argv)
+
+    table = LoadSummaryTable(args.summary_folder)
+    maxPending = 4 * (args.workers or os.cpu_count())
+    with ProcessPoolExecutor(max_workers = args.workers) as executor:
+        futures = deque()
+        for column, graphType in enumerate(graphTypes):
+            for transformation in transformations:
+                outputFolder = os.path.join(args.summary_folder, "CategorizedHistogram-unfixedbin", graphType, transformation)
+                os.makedirs(outputFolder, exist_ok = True)
+                for start in range(0, len(table), plotsPerPage):
+                    page = table[start:start + plotsPerPage]
+                    graphName = f"{graphType}-{transformation}-{start // plotsPerPage + 1}"
+                    figurePath = os.path.join(outputFolder, f"{graphName}.png")
+                    if args.skip_up_to_date and os.path.exists(figurePath) and \
+                       os.path.getmtime(figurePath) > max(mtime for _, mtime, _ in page):
+                        continue
+                    panels = [(title, TransformValues(values[:, column], transformation)) for title, _, values in page]
+                    futures.append(executor.submit(RenderPage, figurePath, graphName, panels))
+                    # keep only a bounded number of pages (and their data) in flight
+                    while len(futures) >= maxPending:
+                        print(f"{futures.popleft().result()} saved. ")
+        while futures:
+            print(f"{futures.popleft().result()} saved. ")
+
+if __name__ == "__main__":
+    main()
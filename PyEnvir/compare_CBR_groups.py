@@ -1,13 +1,13 @@
-import os, numpy
+import os
+from alpha_summary import summarize_folder
 
 datasetPath = "..\\Dataset\\artificial-new\\level0\\rebalanced\\dataset\\R14"
+store, filenames = summarize_folder(datasetPath, "R14_alphaSummary.csv")
 stats = ["filename,min,max,range,mean,median,stddev,var"]
 
-for filename in os.listdir(datasetPath):
-    alphas = []
-    with open(os.path.join(datasetPath, filename)) as file:
-        alphas = [float(row.split(',')[-1]) for row in list(file)[1:]]
-    stats.append(f"{filename.split('.')[0]},{numpy.min(alphas)},{numpy.max(alphas)},{numpy.max(alphas) - numpy.min(alphas)},{numpy.mean(alphas)},{numpy.median(alphas)},{numpy.std(alphas)},{numpy.std(alphas) ** 2}")
+for filename in filenames:
+    s = store.statistics(filename)
+    stats.append(f"{os.path.basename(filename).split('.')[0]},{s['min']},{s['max']},{s['max'] - s['min']},{s['mean']},{s['median']},{s['std']},{s['std'] ** 2}")
 
 with open("R14_stats.csv", 'w') as file:
     file.write('\n'.join(stats))
@@ -1,99 +1,112 @@
+import os
 import time 
+import argparse
 import numpy as np
+from functools import cached_property
 import pandas as pd
 from os import listdir
-from scipy.stats import skew
-from scipy.stats import kurtosis
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from sklearn.tree import DecisionTreeClassifier
+from moments import central_moments, standardized_moments, MomentAccumulator
+from dataset_cache import load_dataset
+from meta_feature_store import MetaFeatureStore
+from instrumentation import step, recording, profiled, write_records
 
-def filter_attribute(X):
-    continous_cols = []
-    nominal_cols = []
-    for i in range(X.shape[1]):
-        col = X[:, i]
-        
-        not_cont = True
-        for ele in col:
-            if ele == 0 or ele == 1:
-                pass
-            else:
-                not_cont = False
+def filter_attribute(X, feature_types=None):
+    '''Split the columns of X into continous and nominal (binary 0/1) attributes, returned as two column index arrays.
+       feature_types gives one 'c' (continous) or 'd' (discrete) per column, as in MLCore's CSV.ReadFromCsv, and skips the scan'''
+    if feature_types is None:
+        is_nominal = np.all((X == 0) | (X == 1), axis=0)
+    elif len(feature_types) != X.shape[1]:
+        raise ValueError(f'{len(feature_types)} feature types given for {X.shape[1]} attributes')
+    else:
+        is_nominal = np.array([t == 'd' for t in feature_types], dtype=bool)
+    
+    return np.flatnonzero(~is_nominal), np.flatnonzero(is_nominal)
 
-        if not_cont:
-            nominal_cols.append(col)
-        else:
-            continous_cols.append(col)
-            
-    return continous_cols, nominal_cols
+def read_feature_types(dataset_filename):
+    '''Feature types from the schema sidecar <dataset>.types next to a dataset, or None if it has none'''
+    types_filename = dataset_filename + '.types'
+    if not os.path.exists(types_filename):
+        return None
+    with open(types_filename) as f:
+        return f.read().strip()
 
 # Information theoretic
 
-def entropy(a):
-    probs = [np.mean(a == c) for c in set(a)]
-    return np.sum(-p * np.log2(p) for p in probs if p > 0)
+def encode_columns(columns):
+    '''Label-encode every column of a 2-D array at once, returning the code matrix and the number of distinct values per column'''
+    order = np.argsort(columns, axis=0, kind='stable')
+    sorted_cols = np.take_along_axis(columns, order, axis=0)
+    is_new = np.ones(sorted_cols.shape, dtype=np.int64)
+    is_new[1:] = sorted_cols[1:] != sorted_cols[:-1]
+    ranks = np.cumsum(is_new, axis=0) - 1
+    
+    codes = np.empty(columns.shape, dtype=np.int64)
+    np.put_along_axis(codes, order, ranks, axis=0)
+    cardinalities = ranks[-1] + 1 if len(ranks) else np.zeros(columns.shape[1], dtype=np.int64)
+    return codes, cardinalities
 
-def joint_entropy_2val(a, b):
-    probs = []
-    for c1 in set(a):
-        for c2 in set(b):
-            probs.append(np.mean(np.logical_and(a == c1, b == c2)))
+def entropy_from_counts(counts, n):
+    probs = counts[counts > 0] / n
+    return np.sum(-probs * np.log2(probs))
 
-    return np.sum(-p * np.log2(p) for p in probs if p > 0)
+def plogp_terms(counts, n):
+    probs = counts / n
+    terms = np.zeros(probs.shape)
+    nonzero = counts > 0
+    terms[nonzero] = -probs[nonzero] * np.log2(probs[nonzero])
+    return terms
 
-def infoMetas(dataset):
-    X = dataset[:, :-1]
-    y = dataset[:, -1]
+def contingency_entropies(attrs, y, y_codes=None):
+    '''Class entropy, then per-attribute entropy, joint entropy with the class and mutual information,
+       for all columns of attrs from a single bincount over the stacked attribute/class contingency tables.
+       y_codes may give the label-encoded classes when they are already known'''
+    n = len(y)
+    if y_codes is None:
+        y_codes = np.unique(y, return_inverse=True)[1].ravel()
+    n_classes = y_codes.max() + 1
+    class_ent = entropy_from_counts(np.bincount(y_codes), n)
     
-    cont, nom = filter_attribute(X)
+    if attrs.shape[1] == 0:
+        empty = np.zeros(0)
+        return class_ent, empty, empty.copy(), empty.copy()
     
-    #Convert continous columns into frequency bins
-    for attr in cont:
-        attr_vals = pd.cut(attr, 10, labels=list(range(10)), retbins=True)[0]
-        nom.append(attr_vals)
+    codes, cardinalities = encode_columns(attrs)
     
-    class_ent = entropy(y)
-    
-    attr_entr = np.zeros(len(nom))
-    attr_entr_norm = np.zeros(attr_entr.shape)
-    mut_info = np.zeros(attr_entr.shape)
-    joint_entr = np.zeros(attr_entr.shape)
-    
-    for i in range(len(nom)):
-        attr  = nom[i]
-        attr_entr_cur = entropy(attr)
-        attr_entr[i] = attr_entr_cur
-        attr_entr_norm[i] = attr_entr_cur / np.log2(len(attr))
-        
-        joint_entr_cur = joint_entropy_2val(attr, y)
-        joint_entr[i] = joint_entr_cur
-        
-        mut_info[i] = class_ent + attr_entr_cur - joint_entr_cur
+    # Each attribute owns a block of cardinality * n_classes cells, laid out as attr_code * n_classes + class_code
+    block_sizes = cardinalities * n_classes
+    offsets = np.concatenate(([0], np.cumsum(block_sizes)[:-1]))
+    joint_counts = np.bincount((offsets + codes * n_classes + y_codes[:, None]).ravel(), minlength=block_sizes.sum())
+    attr_counts = joint_counts.reshape(-1, n_classes).sum(axis=1)
     
+    joint_entr = np.add.reduceat(plogp_terms(joint_counts, n), offsets)
+    attr_entr = np.add.reduceat(plogp_terms(attr_counts, n), offsets // n_classes)
+    mut_info = class_ent + attr_entr - joint_entr
+    return class_ent, attr_entr, joint_entr, mut_info
+
+def infoMetas(dataset, feature_types=None):
     '''ClassEnt, AttrEnt[Min, Mean, Max], JointEnt, MutInfo[Min, Mean, Max], EquiAttr, NoiseRatio'''
-    metas_list = [class_ent, attr_entr_norm.min(), attr_entr_norm.mean(), attr_entr_norm.max(), joint_entr.mean(), 
-                  mut_info.min(), mut_info.mean(), mut_info.max(), class_ent / mut_info.mean(), 
-                  np.abs(attr_entr.mean() - mut_info.mean()) / mut_info.mean()]
-    return metas_list
+    return compute_meta_features(dataset, INFO_FEATURES, feature_types)
 
 # Statistical
 
 def statMetas(dataset):
-    X = dataset[:, :-1]
-    y = dataset[:, -1]
-    
-    #Include all columns as continous attributes
-    cont = X
-        
-    std_x = np.zeros(len(cont))
-    skew_x = np.zeros(std_x.shape)
-    kurtosis_x = np.zeros(std_x.shape)
-
-    for i in range(len(cont)):
-        attr = cont[i]
-        std_x[i] = attr.std()
-        skew_x[i] = skew(attr)
-        kurtosis_x[i] = kurtosis(attr)
-    
+    #Include all columns as continous attributes, one moment pass over all of them
+    return compute_meta_features(dataset, STAT_FEATURES)
+
+def statMetasStreaming(chunks):
+    '''statMetas for datasets larger than memory: chunks yields blocks of dataset rows (label column last)'''
+    accumulator = MomentAccumulator()
+    for chunk in chunks:
+        accumulator.update(np.asarray(chunk)[:, :-1])
+    return moment_metas(*accumulator.standardized_moments())
+
+def read_csv_chunks(filename, chunksize = 100000):
+    for chunk in pd.read_csv(filename, header = None, chunksize = chunksize):
+        yield chunk.values
+
+def moment_metas(std_x, skew_x, kurtosis_x):
     '''StandardDev[Min, Mean, Max], Skewness[Min, Mean, Max], Kurtosis[Min, Mean, Max]'''
     metas_list = [std_x.min(), std_x.mean(), std_x.max(), skew_x.min(), skew_x.mean(), skew_x.max(), 
                   kurtosis_x.min(), kurtosis_x.mean(), kurtosis_x.max()]
@@ -101,129 +114,301 @@ def statMetas(dataset):
 
 # Decision Tree
 
-def decisionTreeMetas(dataset):
-    X = dataset[:, :-1]
-    Y = dataset[:, -1]
-    
-    clf = DecisionTreeClassifier()
-    clf.fit(X, Y)
+def tree_node_depths(children_left, children_right):
+    '''Depth of every node of a fitted tree, propagated from the root one whole level at a time'''
+    node_depth = np.zeros(shape=len(children_left), dtype=np.int64)
+    level = np.array([0])
+    depth = 0
+    while len(level) > 0:
+        node_depth[level] = depth
+        level = level[children_left[level] != children_right[level]]
+        level = np.concatenate((children_left[level], children_right[level]))
+        depth += 1
+    return node_depth
+
+def tree_path_length(children):
+    '''Number of nodes on the path from the root that always takes the given child'''
+    length = 0
+    cur = 0
+    while cur != -1:
+        cur = children[cur]
+        length += 1
+    return length
 
-    model = clf.tree_
-    n_nodes = model.node_count
+def decisionTreeMetas(dataset, clf=None):
+    '''clf may be an already fitted DecisionTreeClassifier, so that one fit serves both these metas and accuracy evaluation'''
+    return compute_meta_features(dataset, TREE_FEATURES, clf=clf)
+
+def tree_structure(model):
+    '''Width, depth of every node, leaf mask, branch lengths, nodes per level and attribute occurence of a fitted tree'''
     children_left = model.children_left
     children_right = model.children_right
     feature = model.feature
-    threshold = model.threshold
-
-    # The tree structure can be traversed to compute various properties such
-    # as the depth of each node and whether or not it is a leaf.
-    node_depth = np.zeros(shape=n_nodes, dtype=np.int64)
-    is_leaves = np.zeros(shape=n_nodes, dtype=bool)
-    n_leaves = 0
-    stack = [(0, -1)]  # seed is the root node id and its parent depth
-    while len(stack) > 0:
-        node_id, parent_depth = stack.pop()
-        node_depth[node_id] = parent_depth + 1
-
-        # If we have a test node
-        if (children_left[node_id] != children_right[node_id]):
-            stack.append((children_left[node_id], parent_depth + 1))
-            stack.append((children_right[node_id], parent_depth + 1))
-        else:
-            is_leaves[node_id] = True
-            n_leaves += 1
 
-    #Tree Width
-    num_left = 0
-    cur = 0
-    while cur != -1:
-        cur = model.children_left[cur]
-        num_left += 1
+    node_depth = tree_node_depths(children_left, children_right)
+    is_leaves = children_left == children_right
 
-    num_right = 0
-    cur = 0
-    while cur != -1:
-        cur = model.children_right[cur]
-        num_right += 1
-
-    n_width = num_left + num_right - 1
+    #Tree Width
+    n_width = tree_path_length(children_left) + tree_path_length(children_right) - 1
 
     #Branches
-    branch_length = []
-    for i in range(n_nodes):
-        if is_leaves[i]:
-            branch_length.append(node_depth[i])
-    branch_length = np.array(branch_length)
+    branch_length = node_depth[is_leaves]
 
     #Nodes per level
-    nodes_level = np.zeros(shape=model.max_depth)
-    for i in node_depth[1:]:
-        nodes_level[i-1] += 1
-
-    #Attribute occurence
-    feature_occr = np.zeros(shape=clf.n_features_)
-    for i in feature:
-        if not i == -2:
-            feature_occr[i] += 1
-
-    #Output
-    '''treewidth, treeheight, NoNode, NoLeave, maxLevel, meanLevel, devLevel, 
-       ShortBranch, meanBranch, devBranch, maxAtt, minAtt, 
-       meanAtt, devAtt'''
-    metas_list = [n_width, model.max_depth, n_nodes, n_leaves, max(nodes_level), nodes_level.mean(), nodes_level.std(),
-                  min(branch_length), branch_length.mean(), branch_length.std(), max(feature_occr), min(feature_occr), 
-                  feature_occr.mean(), feature_occr.std()]
-    return metas_list
+    nodes_level = np.bincount(node_depth[1:] - 1, minlength=model.max_depth).astype(float)
+
+    #Attribute occurence, undefined features of leaves are negative
+    feature_occr = np.bincount(feature[feature >= 0], minlength=model.n_features).astype(float)
+    return { 'width': n_width, 'is_leaves': is_leaves, 'branch_length': branch_length, 'nodes_level': nodes_level, 'feature_occr': feature_occr }
+
+# Registry
+
+class MetaFeatureContext:
+    '''The intermediates meta-features are computed from, each computed on first use and then shared'''
+
+    def __init__(self, dataset, feature_types=None, clf=None):
+        self.X = dataset[:, :-1]
+        self.y = dataset[:, -1]
+        self.n = len(self.y)
+        self.feature_types = feature_types
+        self.clf = clf
+
+    @cached_property
+    def class_codes(self):
+        with step('class counts'):
+            return np.unique(self.y, return_inverse=True)[1].ravel()
+
+    @cached_property
+    def discretized(self):
+        '''Nominal columns as they are, then continous columns converted into 10 frequency bins'''
+        with step('discretization'):
+            cont, nom = filter_attribute(self.X, self.feature_types)
+            binned = [pd.cut(self.X[:, i], 10, labels=False) for i in cont]
+            return np.column_stack([self.X[:, nom]] + binned)
+
+    @cached_property
+    def entropies(self):
+        '''Class entropy, then per-attribute entropy, joint entropy and mutual information'''
+        with step('entropy'):
+            return contingency_entropies(self.discretized, self.y, self.class_codes)
+
+    @cached_property
+    def moments(self):
+        '''Standard deviation, skewness and kurtosis of every column'''
+        with step('moments'):
+            return standardized_moments(*central_moments(self.X, axis = 0))
+
+    @cached_property
+    def tree(self):
+        if self.clf is None:
+            with step('tree fit'):
+                self.clf = DecisionTreeClassifier()
+                self.clf.fit(self.X, self.y)
+        return self.clf.tree_
+
+    @cached_property
+    def tree_structure(self):
+        with step('tree traversal'):
+            return tree_structure(self.tree)
+
+#meta-feature name -> (intermediates it reads, function of the context), in header order
+META_FEATURES = {}
+
+def register(name, intermediates, function):
+    META_FEATURES[name] = (tuple(intermediates), function)
+
+def register_summaries(prefix, intermediates, values, stats=('Min', 'Mean', 'Max')):
+    for stat in stats:
+        register(prefix + stat, intermediates, lambda c, stat=stat: getattr(values(c), stat.lower())())
+
+register('ClassEnt', ['class_codes'], lambda c: entropy_from_counts(np.bincount(c.class_codes), c.n))
+register_summaries('AttrEnt', ['entropies'], lambda c: c.entropies[1] / np.log2(c.n))
+register('JointEnt', ['entropies'], lambda c: c.entropies[2].mean())
+register_summaries('MutInfo', ['entropies'], lambda c: c.entropies[3])
+register('EquiAttr', ['entropies'], lambda c: c.entropies[0] / c.entropies[3].mean())
+register('NoiseRatio', ['entropies'], lambda c: np.abs(c.entropies[1].mean() - c.entropies[3].mean()) / c.entropies[3].mean())
+
+register_summaries('StandardDev', ['moments'], lambda c: c.moments[0])
+register_summaries('Skewness', ['moments'], lambda c: c.moments[1])
+register_summaries('Kurtosis', ['moments'], lambda c: c.moments[2])
+
+register('treewidth', ['tree_structure'], lambda c: c.tree_structure['width'])
+register('treeheight', ['tree'], lambda c: c.tree.max_depth)
+register('NoNode', ['tree'], lambda c: c.tree.node_count)
+register('NoLeave', ['tree_structure'], lambda c: np.count_nonzero(c.tree_structure['is_leaves']))
+register('maxLevel', ['tree_structure'], lambda c: c.tree_structure['nodes_level'].max())
+register('meanLevel', ['tree_structure'], lambda c: c.tree_structure['nodes_level'].mean())
+register('devLevel', ['tree_structure'], lambda c: c.tree_structure['nodes_level'].std())
+register('ShortBranch', ['tree_structure'], lambda c: c.tree_structure['branch_length'].min())
+register('meanBranch', ['tree_structure'], lambda c: c.tree_structure['branch_length'].mean())
+register('devBranch', ['tree_structure'], lambda c: c.tree_structure['branch_length'].std())
+register('maxAtt', ['tree_structure'], lambda c: c.tree_structure['feature_occr'].max())
+register('minAtt', ['tree_structure'], lambda c: c.tree_structure['feature_occr'].min())
+register('meanAtt', ['tree_structure'], lambda c: c.tree_structure['feature_occr'].mean())
+register('devAtt', ['tree_structure'], lambda c: c.tree_structure['feature_occr'].std())
+
+names_list = np.array(list(META_FEATURES))
+INFO_FEATURES, STAT_FEATURES, TREE_FEATURES = list(names_list[:10]), list(names_list[10:19]), list(names_list[19:])
+
+#intermediates built from other intermediates
+INTERMEDIATE_INPUTS = { 'entropies': ('discretized', 'class_codes'), 'tree_structure': ('tree',) }
+
+#extractor each intermediate belongs to; a meta-feature belongs to the extractor of the intermediates it reads,
+#so that timings are recorded per extractor as well as per intermediate
+INTERMEDIATE_EXTRACTORS = { 'class_codes': 'infoMetas', 'discretized': 'infoMetas', 'entropies': 'infoMetas',
+                            'moments': 'statMetas', 'tree': 'decisionTreeMetas', 'tree_structure': 'decisionTreeMetas' }
+EXTRACTORS = ['infoMetas', 'statMetas', 'decisionTreeMetas']
+
+def extractor_of(name):
+    return INTERMEDIATE_EXTRACTORS[META_FEATURES[name][0][0]]
+
+def required_intermediates(names):
+    '''Intermediates the named meta-features need, each after the intermediates it is built from'''
+    order = {}
+    def visit(intermediate):
+        for upstream in INTERMEDIATE_INPUTS.get(intermediate, ()):
+            visit(upstream)
+        order[intermediate] = True
+    for name in names:
+        for intermediate in META_FEATURES[name][0]:
+            visit(intermediate)
+    return list(order)
+
+def compute_meta_features(dataset, names=None, feature_types=None, clf=None):
+    '''Values of the named meta-features (all by default) of one dataset; every intermediate they need
+       is computed once, the others not at all'''
+    names = list(META_FEATURES) if names is None else names
+    unknown = [name for name in names if name not in META_FEATURES]
+    if unknown:
+        raise KeyError(f'Unknown meta-features: {", ".join(unknown)}')
+    context = MetaFeatureContext(dataset, feature_types, clf)
+    intermediates = required_intermediates(names)
+    values = {}
+    for extractor in EXTRACTORS:
+        extractor_names = [name for name in names if extractor_of(name) == extractor]
+        if not extractor_names:
+            continue
+        with step(extractor):
+            for intermediate in intermediates:
+                if INTERMEDIATE_EXTRACTORS[intermediate] == extractor:
+                    getattr(context, intermediate)
+            for name in extractor_names:
+                values[name] = META_FEATURES[name][1](context)
+    return [values[name] for name in names]
 
 # Calculating and saving
 
-dataset_folder = input('dataset folder: ')
-results_folder = input('results folder: ')
-timing_filename = input('timing filename: ')
-header_filename = input('header filename: ')
 
-count = 0
-timing_stats = []
-total_time = 0.0
-datasets = listdir(dataset_folder)
+def has_valid_result(store, filename):
+    '''Whether a previous run already stored a complete, finite meta-feature vector for this dataset'''
+    return filename in store and bool(np.all(np.isfinite(store.get(filename))))
 
-for filename in datasets:
+def process_dataset(dataset_folder, store_filename, filename, instrument = False, memory = False, profile_folder = None, names = None):
+    '''Compute the meta-features (all, or the given names) of one dataset and append them to the meta-feature store,
+       which must already hold these names. Returns (status, duration, steps),
+       never raises, so that one bad dataset cannot stop the rest of the batch. steps holds the per-step timings when
+       instrument is set (with peak allocations when memory is also set); profile_folder receives a pstats dump per dataset'''
+    profile_filename = os.path.join(profile_folder, filename + '.pstats') if profile_folder else None
+    if not instrument:
+        with profiled(profile_filename):
+            return compute_and_save(dataset_folder, store_filename, filename, names) + ([],)
+    with recording(memory, dataset = filename) as recorder, profiled(profile_filename):
+        status, duration = compute_and_save(dataset_folder, store_filename, filename, names)
+    return status, duration, recorder.records
 
-    dataset = pd.read_csv(dataset_folder + '\\' + filename, header = None).values
-    
+def compute_and_save(dataset_folder, store_filename, filename, names = None):
+    path = os.path.join(dataset_folder, filename)
     try:
+        dataset = load_dataset(path, has_header = False).table
         start = time.time()
-        temp = infoMetas(dataset) + statMetas(dataset) + decisionTreeMetas(dataset)
+        temp = compute_meta_features(dataset, names, read_feature_types(path))
         duration = time.time() - start
-        total_time += duration
-        count += 1
-        print(f'{count}\t{filename}\t{duration}\t{total_time}')
-        timing_stats.append(f'{filename},{duration},{total_time}\n')
-    except ValueError:
-        print('Dataset without continous attributes found: ', filename)
-    else:
-        has_nan = np.any(np.isnan(temp))
-        has_inf = np.any(np.isinf(temp))
-        if has_nan and has_inf:
-            print('Dataset has both nan and inf: ', filename)
-            break
-        elif has_nan:
-            print('Dataset has nan: ', filename)
-            break
-        elif has_inf:
-            print('Dataset has inf: ', filename)
-            break
-    
-    temp = np.array(temp)
-    temp.dump(results_folder + '\\' + filename + '.npy')
+    except Exception as e:
+        # recorded in the manifest, so keep the actual reason (single class, ragged CSV, type sidecar mismatch, ...)
+        return f'{type(e).__name__}: {e}', None
+
+    has_nan = np.any(np.isnan(temp))
+    has_inf = np.any(np.isinf(temp))
+    if has_nan and has_inf:
+        return 'has both nan and inf', duration
+    elif has_nan:
+        return 'has nan', duration
+    elif has_inf:
+        return 'has inf', duration
+
+    # One locked append of a whole record, so an interrupted run never leaves a truncated result behind
+    MetaFeatureStore(store_filename).append(filename, np.array(temp, dtype = float))
+    return 'ok', duration
 
-with open(timing_filename, 'w') as f: 
-    f.writelines(timing_stats) 
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = 'Generate conventional meta-features for every dataset in a folder. ')
+    parser.add_argument('dataset_folder')
+    parser.add_argument('results_folder', help = 'folder of the meta-feature store and the manifest')
+    parser.add_argument('--timing', default = 'timing.csv', help = 'timing filename, appended to across runs')
+    parser.add_argument('--store', help = 'meta-feature store, defaults to meta_features.mfs in the results folder')
+    parser.add_argument('--header', help = 'also dump the meta-feature names to this pickled .npy header file')
+    parser.add_argument('--manifest', help = 'completion manifest, defaults to manifest.csv in the results folder')
+    parser.add_argument('--workers', type = int, default = os.cpu_count(), help = 'number of worker processes')
+    parser.add_argument('--force', action = 'store_true', help = 'recompute datasets that already have a valid result')
+    parser.add_argument('--steps', help = 'write wall/CPU time of every extractor and sub-step per dataset to this .csv or .json')
+    parser.add_argument('--memory', action = 'store_true', help = 'also record the peak allocation of every step (slower)')
+    parser.add_argument('--profile-folder', help = 'write a cProfile pstats dump per dataset to this folder')
+    parser.add_argument('--features', nargs = '+', metavar = 'NAME', help = 'compute only these meta-features, in this order')
+    args = parser.parse_args(argv)
+
+    names = args.features or list(names_list)
+    unknown = [name for name in names if name not in META_FEATURES]
+    if unknown:
+        parser.error(f'unknown meta-features {", ".join(unknown)}, choose from {", ".join(names_list)}')
+
+    os.makedirs(args.results_folder, exist_ok = True)
+    manifest_filename = args.manifest or os.path.join(args.results_folder, 'manifest.csv')
+    if args.profile_folder:
+        os.makedirs(args.profile_folder, exist_ok = True)
+    store_filename = args.store or os.path.join(args.results_folder, 'meta_features.mfs')
+    try:
+        store = MetaFeatureStore(store_filename, names)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.header:
+        np.array(names).dump(args.header)
+
+    datasets = sorted(filename for filename in listdir(args.dataset_folder) if not filename.endswith('.types'))
+    pending = [filename for filename in datasets if args.force or not has_valid_result(store, filename)]
+    print(f'{len(datasets) - len(pending)} of {len(datasets)} datasets already done, {len(pending)} to go')
+
+    count = 0
+    total_time = 0.0
+    step_records = []
+    write_manifest_header = not os.path.exists(manifest_filename)
+    with open(manifest_filename, 'a') as manifest, open(args.timing, 'a') as timing, \
+         ProcessPoolExecutor(max_workers = args.workers) as executor:
+        if write_manifest_header:
+            manifest.write('filename,status,duration\n')
+        futures = {executor.submit(process_dataset, args.dataset_folder, store_filename, filename,
+                                   bool(args.steps), args.memory, args.profile_folder, names): filename for filename in pending}
+        for future in as_completed(futures):
+            filename = futures[future]
+            try:
+                status, duration, steps = future.result()
+                step_records += steps
+            except Exception as e:
+                # The worker process itself died, e.g. out of memory
+                status, duration = f'{type(e).__name__}: {e}', None
+
+            if status == 'ok':
+                total_time += duration
+                count += 1
+                print(f'{count}\t{filename}\t{duration}\t{total_time}')
+                timing.write(f'{filename},{duration},{total_time}\n')
+                timing.flush()
+            else:
+                print(f'Dataset {status}: ', filename)
+            manifest.write(f'{filename},"{status.replace(chr(34), chr(39))}",{"" if duration is None else duration}\n')
+            manifest.flush()
 
-names_list = 'ClassEnt, AttrEntMin, AttrEntMean, AttrEntMax, JointEnt, MutInfoMin, MutInfoMean, MutInfoMax, EquiAttr,' + \
-             'NoiseRatio, StandardDevMin, StandardDevMean, StandardDevMax, SkewnessMin, SkewnessMean, SkewnessMax,' + \
-             'KurtosisMin, KurtosisMean, KurtosisMax, treewidth, treeheight, NoNode, NoLeave, maxLevel, meanLevel, devLevel,' + \
-             'ShortBranch, meanBranch, devBranch, maxAtt, minAtt, meanAtt, devAtt'
-names_list = np.array([x.strip() for x in names_list.split(',')])
+    if args.steps:
+        write_records(args.steps, step_records)
 
-names_list.dump(header_filename)
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+'''Columnar binary cache for CSV datasets.
+
+Each CSV is parsed once into a column-major float64 .npy that later loads memory-map instead of re-parsing,
+next to a small .json holding the header and the fingerprint (size, mtime, sha1) of the source file.
+A cache entry is rebuilt as soon as the source file's content changes.
+'''
+
+import os, json, hashlib
+import numpy as np
+
+def default_cache_folder():
+    return os.environ.get('DATASET_CACHE') or os.path.join(os.path.expanduser('~'), '.cache', 'pyenvir-datasets')
+
+class CachedDataset:
+    '''A dataset table (rows x columns, memory-mapped read-only) with its header and feature/label/alpha columns.
+       The label is the column named "label", or the last column when there is no header;
+       the alpha column is the one named "alpha", as written by MLCore's AlphaTasks.'''
+
+    def __init__(self, table, header, source_hash):
+        self.table = table
+        self.header = header
+        self.source_hash = source_hash
+        self.label_column = header.index('label') if 'label' in header else table.shape[1] - 1
+        self.alpha_column = header.index('alpha') if 'alpha' in header else None
+
+    @property
+    def features(self):
+        return self.table[:, :self.label_column]
+
+    @property
+    def labels(self):
+        return self.table[:, self.label_column]
+
+    @property
+    def alphas(self):
+        if self.alpha_column is None:
+            raise KeyError('Dataset has no alpha column. ')
+        return self.table[:, self.alpha_column]
+
+def file_hash(filename):
+    sha1 = hashlib.sha1()
+    with open(filename, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+def first_row_is_header(filename):
+    with open(filename) as file:
+        fields = file.readline().strip().split(',')
+    try:
+        [float(field) for field in fields]
+    except ValueError:
+        return True
+    return False
+
+def parse_csv(filename, has_header):
+    '''Parse a rectangular, all-numeric CSV; raises ValueError on ragged rows or non-numeric fields'''
+    header = []
+    if has_header:
+        with open(filename) as file:
+            header = [field.strip() for field in file.readline().strip().split(',')]
+    table = np.loadtxt(filename, delimiter = ',', skiprows = 1 if has_header else 0, ndmin = 2)
+    return table, header
+
+def atomic_write(filename, write):
+    temp_filename = f'{filename}.{os.getpid()}.tmp'
+    with open(temp_filename, 'wb') as file:
+        write(file)
+    os.replace(temp_filename, filename)
+
+def load_dataset(filename, has_header = None, cache_folder = None):
+    '''Load a CSV dataset through the cache. has_header=None detects a non-numeric first row as the header.'''
+    cache_folder = cache_folder or default_cache_folder()
+    os.makedirs(cache_folder, exist_ok = True)
+    source = os.path.abspath(filename)
+    key = hashlib.sha1(source.encode()).hexdigest()[:16] + '-' + os.path.basename(source)
+    table_filename = os.path.join(cache_folder, key + '.npy')
+    info_filename = os.path.join(cache_folder, key + '.json')
+
+    stat = os.stat(source)
+    info = None
+    if os.path.exists(info_filename) and os.path.exists(table_filename):
+        with open(info_filename) as file:
+            info = json.load(file)
+        if has_header is not None and info['hasHeader'] != has_header:
+            info = None
+        elif info['size'] != stat.st_size or info['mtime'] != stat.st_mtime_ns:
+            # Touched or rewritten: only a content change invalidates the table
+            source_hash = file_hash(source)
+            if info['sha1'] != source_hash or info['size'] != stat.st_size:
+                info = None
+            else:
+                info['mtime'] = stat.st_mtime_ns
+                atomic_write(info_filename, lambda file: file.write(json.dumps(info).encode()))
+
+    if info is None:
+        has_header = first_row_is_header(source) if has_header is None else has_header
+        table, header = parse_csv(source, has_header)
+        atomic_write(table_filename, lambda file: np.save(file, np.asfortranarray(table)))
+        info = { 'source': source, 'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'sha1': file_hash(source),
+                 'hasHeader': has_header, 'header': header }
+        atomic_write(info_filename, lambda file: file.write(json.dumps(info).encode()))
+
+    return CachedDataset(np.load(table_filename, mmap_mode = 'r'), info['header'], info['sha1'])
@@ -0,0 +1,124 @@
+'''Single-pass profile of CSV datasets: shape, rectangularity, label counts and class balance.
+
+Files are read as raw bytes in fixed-size chunks and only counters are kept, so memory stays constant
+however large a file is; a folder is profiled one file per process.
+'''
+
+import os, argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+CHUNK_SIZE = 1 << 24
+
+def label_text(raw):
+    '''Integral labels are written as integers ("1.0" and "1" are the same class), other numbers in their
+       round-trip float form, so distinct values never merge'''
+    try:
+        value = float(raw)
+    except ValueError:
+        return raw
+    return str(int(value)) if value.is_integer() else repr(value)
+
+def label_sort_key(label):
+    try:
+        return (0, float(label), label)
+    except ValueError:
+        return (1, 0.0, label)
+
+class DatasetProfile:
+    '''Row and column counts, the number of rows whose field count differs from the first row, and label counts.
+       column_count includes the label column. label_counts merges spellings of the same number ("1.0" and "1"),
+       raw_label_counts keeps every label as written in the file.'''
+
+    def __init__(self, filename, row_count, column_count, violations, label_counts, raw_label_counts = None):
+        self.filename = filename
+        self.row_count = row_count
+        self.column_count = column_count
+        self.violations = violations
+        self.label_counts = label_counts
+        self.raw_label_counts = raw_label_counts if raw_label_counts is not None else dict(label_counts)
+
+    @property
+    def labels(self):
+        return sorted(self.label_counts, key = label_sort_key)
+
+    @property
+    def cbr(self):
+        '''Class balance ratio: minority count over majority count'''
+        return min(self.label_counts.values()) / max(self.label_counts.values()) if self.label_counts else float('nan')
+
+    @property
+    def nir(self):
+        '''No-information rate: the share of the majority class'''
+        return max(self.label_counts.values()) / self.row_count if self.row_count else float('nan')
+
+def iter_lines(filename, chunk_size = CHUNK_SIZE):
+    '''Lists of non-empty lines, one list per chunk; a line split by a chunk boundary is carried to the next chunk'''
+    remainder = b''
+    with open(filename, 'rb') as file:
+        for block in iter(lambda: file.read(chunk_size), b''):
+            lines = (remainder + block).split(b'\n')
+            remainder = lines.pop()
+            yield [line.rstrip(b'\r') for line in lines if line.strip()]
+    if remainder.strip():
+        yield [remainder.rstrip(b'\r')]
+
+def label_field(line, label_column):
+    if label_column is None:
+        return line.rpartition(b',')[2].strip()
+    fields = line.split(b',', label_column + 1)
+    return fields[label_column].strip() if len(fields) > label_column else None
+
+def profile_file(filename, has_header = False, chunk_size = CHUNK_SIZE, label_column = None):
+    '''Profile of one CSV; the label is the field at label_column, or the last field of a row when it is None.
+       Rows too short to have a label column are left out of the label counts (they are violations anyway)'''
+    field_counts = Counter()
+    raw_labels = Counter()
+    column_count = None
+    skip_header = has_header
+    for lines in iter_lines(filename, chunk_size):
+        if skip_header and lines:
+            lines = lines[1:]
+            skip_header = False
+        if column_count is None and lines:
+            column_count = lines[0].count(b',') + 1
+        field_counts.update(line.count(b',') + 1 for line in lines)
+        raw_labels.update(label_field(line, label_column) for line in lines)
+
+    column_count = column_count or 0
+    row_count = sum(field_counts.values())
+    label_counts = Counter()
+    raw_labels.pop(None, None)
+    raw_label_counts = { raw.decode(): count for raw, count in raw_labels.items() }
+    for raw, count in raw_label_counts.items():
+        label_counts[label_text(raw)] += count
+    return DatasetProfile(filename, row_count, column_count, row_count - field_counts[column_count], dict(label_counts), raw_label_counts)
+
+def profile_folder(folder, has_header = False, workers = None, label_column = None):
+    '''Profiles of every file in a folder, in listing order'''
+    filenames = [os.path.join(folder, filename) for filename in sorted(os.listdir(folder))]
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        yield from executor.map(profile_file, filenames, [has_header] * len(filenames), [CHUNK_SIZE] * len(filenames),
+                                [label_column] * len(filenames), chunksize = 4)
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Profile every CSV dataset of a folder in one streaming pass per file. ")
+    parser.add_argument("dataset_folder")
+    parser.add_argument("--output", default = "dataset_profile.csv")
+    parser.add_argument("--header", action = "store_true", help = "datasets start with a header row")
+    parser.add_argument("--workers", type = int, default = None, help = "number of profiling processes")
+    parser.add_argument("--label-column", type = int, default = None, help = "0-based column of the label, the last one by default")
+    args = parser.parse_args(argv)
+
+    stats = ["filename,instanceCount,columnCount,violations,labelCount,labelCounts,CBR,NIR"]
+    for profile in profile_folder(args.dataset_folder, args.header, args.workers, args.label_column):
+        labelCounts = ';'.join(f"{label}:{profile.label_counts[label]}" for label in profile.labels)
+        stats.append(f"{os.path.basename(profile.filename).split('.')[0]},{profile.row_count},{profile.column_count},"
+                     f"{profile.violations},{len(profile.label_counts)},{labelCounts},{profile.cbr},{profile.nir}")
+        print(f"Finished profiling {profile.filename}")
+
+    with open(args.output, 'w') as file:
+        file.write('\n'.join(stats))
+
+if __name__ == "__main__":
+    main()
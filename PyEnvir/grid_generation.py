@@ -0,0 +1,41 @@
+import numpy as np
+
+def grid_points(size):
+	'''Coordinates of a size x size grid over the unit square; cell i sits at (i // size, i % size) * (1 / (size - 1))'''
+	cells = np.arange(size * size)
+	return np.column_stack((cells // size, cells % size)) * (1 / (size - 1))
+
+def split_sections(n_cells, n_sections, rng):
+	'''Shuffle the cells and deal them round-robin into n_sections sections; returns the section of every cell'''
+	if n_sections > n_cells:
+		raise ValueError(f"Cannot divide {n_cells} cells into {n_sections} non-empty sections. ")
+	section = np.empty(n_cells, dtype=np.int64)
+	section[rng.permutation(n_cells)] = np.arange(n_cells) % n_sections
+	return section
+
+def section_centroids(points, section, n_sections):
+	'''For every section, the cell with the smallest sum of squared distances to all other cells of its section.
+
+	The pairwise sums are taken all at once from per-section totals, since
+	sum_j |x_i - x_j|^2 = n_s * |x_i|^2 - 2 * x_i . sum_j x_j + sum_j |x_j|^2,
+	which keeps the search linear in the number of cells instead of quadratic per section.'''
+	counts = np.bincount(section, minlength=n_sections)
+	sq_norms = np.einsum('ij,ij->i', points, points)
+	sums = np.column_stack([np.bincount(section, weights=points[:, d], minlength=n_sections) for d in range(points.shape[1])])
+	sq_sums = np.bincount(section, weights=sq_norms, minlength=n_sections)
+
+	dist_sums = counts[section] * sq_norms - 2 * np.einsum('ij,ij->i', points, sums[section]) + sq_sums[section]
+
+	# argmin within each section: sort by (section, dist_sums) and take the first cell of every section
+	order = np.lexsort((dist_sums, section))
+	return order[np.searchsorted(section[order], np.arange(n_sections))]
+
+def generate_sections(size, k, rng):
+	'''Grid points, the 2^k section centroids and a boolean mask marking them'''
+	points = grid_points(size)
+	n_sections = 2 ** k
+	section = split_sections(len(points), n_sections, rng)
+	centroids = section_centroids(points, section, n_sections)
+	is_centroid = np.zeros(len(points), dtype=bool)
+	is_centroid[centroids] = True
+	return points, centroids, is_centroid
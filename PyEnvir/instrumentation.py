@@ -0,0 +1,92 @@
+'''Opt-in timing of named steps: wall time, CPU time and peak traced allocation.
+
+Code marks its steps with "with step(name):". Outside of a recording this is a no-op costing one global lookup.
+Inside "with recording() as recorder:" every step is recorded under its nested path (e.g. infoMetas/entropy);
+with memory=True tracemalloc also reports the peak allocation above the step's starting point, nested steps included.
+'''
+
+import csv, json, time, cProfile, tracemalloc
+from contextlib import contextmanager, nullcontext
+
+_recorder = None
+_no_op = nullcontext()
+
+class StepRecorder:
+    def __init__(self, memory = False):
+        self.memory = memory
+        self.records = []
+        self.stack = []
+        self.labels = {}
+
+    @contextmanager
+    def step(self, name):
+        path = '/'.join([entry['name'] for entry in self.stack] + [name])
+        entry = { 'name': name }
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.stack:
+                self.stack[-1]['max_seen'] = max(self.stack[-1]['max_seen'], peak)
+            tracemalloc.reset_peak()
+            entry['start_memory'] = entry['max_seen'] = current
+        self.stack.append(entry)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            self.stack.pop()
+            peak_bytes = None
+            if self.memory:
+                entry['max_seen'] = max(entry['max_seen'], tracemalloc.get_traced_memory()[1])
+                peak_bytes = entry['max_seen'] - entry['start_memory']
+                if self.stack:
+                    self.stack[-1]['max_seen'] = max(self.stack[-1]['max_seen'], entry['max_seen'])
+                tracemalloc.reset_peak()
+            self.records.append({ **self.labels, 'step': path, 'wall': wall, 'cpu': cpu, 'peak_bytes': peak_bytes })
+
+def step(name):
+    return _no_op if _recorder is None else _recorder.step(name)
+
+@contextmanager
+def recording(memory = False, **labels):
+    '''Record the steps run in this block; labels (e.g. dataset = filename) are added to every record'''
+    global _recorder
+    previous = _recorder
+    recorder = StepRecorder(memory)
+    recorder.labels = labels
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    _recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _recorder = previous
+        if started_tracing:
+            tracemalloc.stop()
+
+@contextmanager
+def profiled(filename):
+    '''cProfile the block into a pstats file when filename is given'''
+    if filename is None:
+        yield
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(filename)
+
+def write_records(filename, records):
+    '''Export step records as JSON (.json) or CSV (anything else)'''
+    if filename.endswith('.json'):
+        with open(filename, 'w') as file:
+            json.dump(records, file, indent = 1)
+        return
+    fields = list(dict.fromkeys(key for record in records for key in record))
+    with open(filename, 'w', newline = '') as file:
+        writer = csv.DictWriter(file, fields)
+        writer.writeheader()
+        writer.writerows(records)
@@ -0,0 +1,179 @@
+'''Single-file, appendable table of meta-feature vectors.
+
+Layout: a magic line, the length of a JSON header block ({"names": [...]}) as 8 little-endian bytes and the block
+itself padded to a multiple of 4096 bytes, then fixed-size records of a dataset name (up to 128 bytes) and one float64
+per meta-feature. A record is appended with a single write on a file opened with O_APPEND, under an exclusive lock,
+so worker processes can append concurrently. Reading memory-maps the records: the whole matrix is a zero-copy view,
+and a dataset that was appended more than once resolves to its latest record. A partial trailing record (a writer
+killed mid-write) is ignored by readers and cut off by the next append, so later records stay aligned.
+'''
+
+import os, sys, json, argparse
+import numpy as np
+
+if sys.platform == 'win32':
+    import msvcrt
+else:
+    import fcntl
+
+MAGIC = b'PYENVIR-MFS1\n'
+BLOCK = 4096
+NAME_BYTES = 128
+
+def lock(fd):
+    if sys.platform == 'win32':
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+def unlock(fd):
+    if sys.platform == 'win32':
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+def record_dtype(n_features):
+    return np.dtype([('name', f'S{NAME_BYTES}'), ('values', '<f8', (n_features,))])
+
+class MetaFeatureStore:
+    '''Opens the store at filename, creating it with the given meta-feature names if it does not exist yet'''
+
+    def __init__(self, filename, names = None):
+        self.filename = filename
+        if not os.path.exists(filename):
+            if names is None:
+                raise FileNotFoundError(f'{filename} does not exist and no meta-feature names were given to create it. ')
+            self.create(filename, names)
+        self.names, self.offset = self.read_header(filename)
+        if names is not None and list(names) != self.names:
+            raise ValueError(f'{filename} holds the meta-features {self.names}, not {list(names)}. ')
+        self.dtype = record_dtype(len(self.names))
+        self._index = None
+
+    @staticmethod
+    def create(filename, names):
+        header = json.dumps({ 'names': list(names) }).encode()
+        size = -(-(len(MAGIC) + 8 + len(header)) // BLOCK) * BLOCK
+        block = (MAGIC + len(header).to_bytes(8, 'little') + header).ljust(size, b' ')
+        try:
+            fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0))
+        except FileExistsError:
+            # another worker created it first
+            return
+        try:
+            os.write(fd, block)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def read_header(filename):
+        with open(filename, 'rb') as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{filename} is not a meta-feature store. ')
+            length = int.from_bytes(file.read(8), 'little')
+            header = json.loads(file.read(length))
+        return header['names'], -(-(len(MAGIC) + 8 + length) // BLOCK) * BLOCK
+
+    def append(self, name, values):
+        '''Append the meta-feature vector of one dataset; a later record for the same name supersedes earlier ones'''
+        encoded = name.encode()
+        if len(encoded) > NAME_BYTES:
+            raise ValueError(f'Dataset name {name} is longer than {NAME_BYTES} bytes. ')
+        record = np.zeros(1, dtype = self.dtype)
+        record['name'] = encoded
+        record['values'] = values
+        fd = os.open(self.filename, os.O_WRONLY | os.O_APPEND | getattr(os, 'O_BINARY', 0))
+        try:
+            lock(fd)
+            try:
+                size = os.fstat(fd).st_size
+                torn = (size - self.offset) % self.dtype.itemsize if size > self.offset else 0
+                if torn:
+                    os.ftruncate(fd, size - torn)
+                os.write(fd, record.tobytes())
+            finally:
+                unlock(fd)
+        finally:
+            os.close(fd)
+        self._index = None
+
+    def records(self):
+        '''All complete records, memory-mapped read-only'''
+        count = (os.path.getsize(self.filename) - self.offset) // self.dtype.itemsize
+        if count <= 0:
+            return np.zeros(0, dtype = self.dtype)
+        return np.memmap(self.filename, dtype = self.dtype, mode = 'r', offset = self.offset, shape = (count,))
+
+    def matrix(self):
+        '''(records x meta-features) view of every record, in append order, without copying'''
+        return self.records()['values']
+
+    def index(self):
+        '''Dataset name -> row of its latest record'''
+        if self._index is None:
+            names = self.records()['name']
+            self._index = { name.decode(): row for row, name in enumerate(names.tolist()) }
+        return self._index
+
+    def __contains__(self, name):
+        return name in self.index()
+
+    def __len__(self):
+        return len(self.index())
+
+    def get(self, name):
+        return np.array(self.matrix()[self.index()[name]])
+
+    def latest(self):
+        '''Dataset names and their latest meta-feature vectors; a zero-copy view unless some dataset was appended twice'''
+        index = self.index()
+        records = self.records()
+        if len(index) == len(records):
+            return list(index), records['values']
+        rows = np.fromiter(index.values(), dtype = np.int64, count = len(index))
+        return list(index), records['values'][rows]
+
+def import_npy_folder(store, results_folder, skip_existing = True):
+    '''Append the <dataset>.npy vectors written by earlier runs of conventional_meta_feature_generation;
+       returns the number of imported datasets'''
+    count = 0
+    for filename in sorted(os.listdir(results_folder)):
+        if not filename.endswith('.npy'):
+            continue
+        name = filename[:-len('.npy')]
+        if skip_existing and name in store:
+            continue
+        values = np.load(os.path.join(results_folder, filename), allow_pickle = True)
+        if values.shape != (len(store.names),):
+            print(f'Skipping {filename}: {values.shape[0] if values.ndim else 0} values for {len(store.names)} meta-features')
+            continue
+        store.append(name, values.astype(float))
+        count += 1
+    return count
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = 'Import per-dataset .npy meta-features into a store, or export a store to CSV. ')
+    subparsers = parser.add_subparsers(dest = 'command', required = True)
+    importer = subparsers.add_parser('import')
+    importer.add_argument('results_folder')
+    importer.add_argument('store')
+    importer.add_argument('--header', default = 'header.npy', help = 'pickled meta-feature names of the .npy files')
+    exporter = subparsers.add_parser('export')
+    exporter.add_argument('store')
+    exporter.add_argument('output')
+    args = parser.parse_args(argv)
+
+    if args.command == 'import':
+        store = MetaFeatureStore(args.store, np.load(args.header, allow_pickle = True).tolist())
+        print(f'Imported {import_npy_folder(store, args.results_folder)} datasets, {len(store)} in the store')
+    else:
+        store = MetaFeatureStore(args.store)
+        names, matrix = store.latest()
+        lines = ['dataset,' + ','.join(store.names)] + [f"{name},{','.join(map(str, row))}" for name, row in zip(names, matrix.tolist())]
+        with open(args.output, 'w') as file:
+            file.write('\n'.join(lines) + '\n')
+
+if __name__ == '__main__':
+    main()
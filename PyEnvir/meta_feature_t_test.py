@@ -1,30 +1,27 @@
-import os
-from scipy import stats 
+import os, argparse
+import numpy as np
+from significance_testing import compare, CORRECTIONS, ERROR
 
-def paired_t_test(accuracies1, accuracies2): 
-    t_test = stats.ttest_ind(accuracies1, accuracies2) 
-    t_test_value = t_test[0]
+# left(1)/draw(0)/right(2); failed tests are reported as nan
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "t-test one meta-feature set's accuracies against every other set. ")
+    parser.add_argument("accuracy_file", nargs = "?", default = os.path.join(os.path.expanduser('~'), "Desktop", "UCI analysis", "accy", "6.csv"),
+                        help = "one row of accuracies per meta-feature set, no header")
+    parser.add_argument("--reference", type = int, default = 1, help = "1-based row of the set the others are compared with")
+    parser.add_argument("--alpha", type = float, default = 0.05)
+    parser.add_argument("--correction", choices = list(CORRECTIONS), default = "none")
+    parser.add_argument("--paired", action = "store_true", help = "use the paired (related samples) t-test")
+    args = parser.parse_args(argv)
 
-    # cannot reject null hypothesis 
-    if t_test[1] > 0.05:
-        t_test_value = 0 
+    values = np.loadtxt(args.accuracy_file, delimiter = ',', ndmin = 2)
+    reference = args.reference - 1
+    others = [i for i in range(len(values)) if i != reference]
+    tStats, pValues, adjusted, outcome = compare(values[reference], values[others], args.alpha, args.correction, paired = args.paired)
 
-    # if t test result is positive, algo1 is better, if t test result is negative, algo2 is better, if t test result is 0, then draw
-    if t_test_value == 0:
-        label = 0
-    elif t_test_value > 0:
-        label = 1
-    elif t_test_value < 0:
-        label = 2 
-    else: 
-        label = t_test_value 
-    return label, t_test[0], t_test[1]
+    print("left(1)/draw(0)/right(2),t-statistic,p-value" + (",adjusted-p-value" if args.correction != "none" else ""))
+    for i, label, tStat, pValue, aValue in zip(others, outcome.tolist(), tStats.tolist(), pValues.tolist(), adjusted.tolist()):
+        label = "nan" if label == ERROR else label
+        print(f"Set{reference + 1} vs Set{i + 1},{label},{tStat},{pValue}" + (f",{aValue}" if args.correction != "none" else ""))
 
-values = []
-with open(f"{os.path.expanduser('~\\Desktop')}\\UCI analysis\\accy\\6.csv") as file:
-    values = [[float(value) for value in row.split(',')] for row in list(file)]
-
-print("left(1)/draw(0)/right(2),t-statistic,p-value")
-for i in range(1, 12):
-    label, tStats, pValue = paired_t_test(values[0], values[i])
-    print(f"Set1 vs Set{i + 1},{label},{tStats},{pValue}")
+if __name__ == "__main__":
+    main()
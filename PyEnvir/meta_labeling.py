@@ -0,0 +1,95 @@
+'''Statistical meta-labels from the fold accuracies of any number of base learners.
+
+Fold accuracies of all datasets are stacked into one (datasets x algorithms x folds) array and every algorithm pair
+is compared with a single vectorized t-test. A comparison ends in a draw (0), the first algorithm being better (1)
+or the second being better (2). The label of a dataset is the set of best algorithms: those no other algorithm beats,
+provided each of them beats all the others. Labels number these sets as 0 for "all tied", then the single algorithms,
+then pairs and so on in itertools.combinations order, which for KNN/NB/DT gives the labels 0-6 used so far.
+Datasets whose outcomes admit no such set are contradictions.
+'''
+
+import os
+import numpy as np
+from itertools import combinations
+from scipy import stats
+
+ERROR = -1
+
+def read_accuracies(accuracy_filenames):
+    '''accuracy_filenames maps algorithm names to CSVs of "name,fold accuracies...". Returns the dataset names
+       (in the order of the first file), the algorithm names and the stacked accuracy array; missing values are nan'''
+    algorithms = list(accuracy_filenames)
+    per_algorithm = []
+    for algorithm in algorithms:
+        with open(accuracy_filenames[algorithm]) as f:
+            rows = [line.rstrip('\n').split(',') for line in f if line.strip()]
+        per_algorithm.append({ row[0]: [float(value) for value in row[1:]] for row in rows })
+
+    names = list(per_algorithm[0])
+    n_folds = max(len(values) for accuracies in per_algorithm for values in accuracies.values())
+    acc = np.full((len(names), len(algorithms), n_folds), np.nan)
+    for a, accuracies in enumerate(per_algorithm):
+        for d, name in enumerate(names):
+            values = accuracies.get(name, [])
+            acc[d, a, :len(values)] = values
+    return names, algorithms, acc
+
+def algorithm_pairs(n_algorithms):
+    return np.array(list(combinations(range(n_algorithms), 2)), dtype = np.int64).reshape(-1, 2)
+
+def pairwise_outcomes(acc, alpha = 0.05):
+    '''Outcome of the t-test of every algorithm pair on every dataset, computed in one call along the fold axis:
+       0 draw (cannot reject the null hypothesis), 1 first algorithm better, 2 second better, ERROR if the test failed'''
+    pairs = algorithm_pairs(acc.shape[1])
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        t, p = stats.ttest_ind(acc[:, pairs[:, 0]], acc[:, pairs[:, 1]], axis = 2)
+    outcome = np.where(p > alpha, 0, np.where(t > 0, 1, 2))
+    outcome[np.isnan(t)] = ERROR
+    return outcome
+
+def winner_set_labels(n_algorithms):
+    '''Lookup array from the bitmask of a set of best algorithms to its label, ERROR for the empty set'''
+    lookup = np.full(1 << n_algorithms, ERROR, dtype = np.int64)
+    lookup[(1 << n_algorithms) - 1] = 0
+    label = 1
+    for size in range(1, n_algorithms):
+        for winners in combinations(range(n_algorithms), size):
+            lookup[sum(1 << a for a in winners)] = label
+            label += 1
+    return lookup
+
+def labels_from_outcomes(outcome, n_algorithms):
+    '''Label of every dataset from its pairwise outcomes, ERROR for contradictions and failed tests'''
+    pairs = algorithm_pairs(n_algorithms)
+    beats = np.zeros((len(outcome), n_algorithms, n_algorithms), dtype = bool)
+    beats[:, pairs[:, 0], pairs[:, 1]] = outcome == 1
+    beats[:, pairs[:, 1], pairs[:, 0]] = outcome == 2
+
+    winners = ~beats.any(axis = 1)
+    must_beat = winners[:, :, None] & ~winners[:, None, :]
+    consistent = np.all(beats | ~must_beat, axis = (1, 2)) & winners.any(axis = 1) & ~(outcome == ERROR).any(axis = 1)
+
+    masks = winners.astype(np.int64) @ (1 << np.arange(n_algorithms, dtype = np.int64))
+    return np.where(consistent, winner_set_labels(n_algorithms)[masks], ERROR)
+
+def label_datasets(accuracy_filenames, output_folder, alpha = 0.05):
+    '''Write the raw pairwise results, t-test errors, contradictions and labels of every dataset to output_folder'''
+    names, algorithms, acc = read_accuracies(accuracy_filenames)
+    outcome = pairwise_outcomes(acc, alpha)
+    labels = labels_from_outcomes(outcome, len(algorithms))
+    failed = (outcome == ERROR).any(axis = 1)
+
+    pair_header = ','.join(f"{algorithms[i]}-{algorithms[j]}" for i, j in algorithm_pairs(len(algorithms)))
+    outcome_fields = [','.join('nan' if o == ERROR else str(o) for o in row) for row in outcome.tolist()]
+
+    raw_lines = [f"name,{pair_header}"] + [f"{name},{fields}" for name, fields in zip(names, outcome_fields)]
+    error_lines = ["datasetName"] + [name for name, f in zip(names, failed) if f]
+    contradiction_lines = [f"name,{pair_header}"] + \
+        [f"{name},{fields}" for name, fields, f, l in zip(names, outcome_fields, failed, labels) if not f and l == ERROR]
+    label_lines = ["name,label"] + [f"{name},{l}" for name, l in zip(names, labels.tolist()) if l != ERROR]
+
+    for filename, lines in [("paired_t_test_raw_results.csv", raw_lines), ("t_test_error.csv", error_lines),
+                            ("contradictions.csv", contradiction_lines), ("labels.csv", label_lines)]:
+        with open(os.path.join(output_folder, filename), 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+    return names, labels
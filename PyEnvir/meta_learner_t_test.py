@@ -1,20 +1,19 @@
-from scipy import stats 
+from significance_testing import load_score_matrix, compare, ERROR
 
-def WriteTTestResults(accuracyFilename, outputFilename):
-    lines = []
-    output = [ "MSetName,betterModel,t-value,p-value" ]
-    with open(accuracyFilename) as file:
-        lines = list(file)
-    for i in range(1, len(lines)):
-        fields = lines[i].split(',')
-        tValue, pValue = stats.ttest_ind([float(s) for s in fields[1:11]], [float(s) for s in fields[11:21]])
+betterModels = { 0: "Draw", 1: "Beta", 2: "Conventional", ERROR: "Error" }
 
-        if pValue > 0.05:
-            # cannot reject the null hypothesis of identical average scores => draw
-            output.append(f"{fields[0]},Draw,{tValue},{pValue}")
-        else:
-            # reject the null hypothesis of equal averages => one is better than another
-            betterModel = "Beta" if tValue > 0 else "Conventional"
-            output.append(f"{fields[0]},{betterModel},{tValue},{pValue}")
+def WriteTTestResults(accuracyFilename, outputFilename, alpha = 0.05, correction = "none", folds = 10, paired = False):
+    '''Compare the Beta fold scores (the first folds columns after the name) with the Conventional ones (the next folds
+       columns) of every meta-set; columns after those are ignored. An adjusted p-value column is added with a correction'''
+    names, scores = load_score_matrix(accuracyFilename)
+    tValues, pValues, adjusted, outcome = compare(scores[:, :folds], scores[:, folds:2 * folds], alpha, correction, paired = paired)
+
+    if correction == "none":
+        output = [ "MSetName,betterModel,t-value,p-value" ]
+        output += [f"{name},{betterModels[o]},{t},{p}" for name, o, t, p in zip(names, outcome.tolist(), tValues.tolist(), pValues.tolist())]
+    else:
+        output = [ "MSetName,betterModel,t-value,p-value,adjusted-p-value" ]
+        output += [f"{name},{betterModels[o]},{t},{p},{a}"
+                   for name, o, t, p, a in zip(names, outcome.tolist(), tValues.tolist(), pValues.tolist(), adjusted.tolist())]
     with open(outputFilename, 'w') as file:
         file.write('\n'.join(output))
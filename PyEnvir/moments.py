@@ -0,0 +1,71 @@
+import numpy as np
+
+def central_moments(X, axis = 0):
+    '''Mean and the 2nd, 3rd and 4th central moments (divided by n) of X along axis, sharing one pass of deviations'''
+    mean = X.mean(axis = axis, keepdims = True)
+    dev = X - mean
+    dev2 = dev * dev
+    m2 = dev2.mean(axis = axis)
+    m3 = (dev2 * dev).mean(axis = axis)
+    m4 = (dev2 * dev2).mean(axis = axis)
+    return np.squeeze(mean, axis = axis), m2, m3, m4
+
+def standardized_moments(mean, m2, m3, m4):
+    '''Standard deviation, skewness and excess kurtosis from central moments. Matches np.std, scipy.stats.skew
+       and scipy.stats.kurtosis with their default (biased, Fisher) settings, including nan for constant attributes'''
+    mean, m2, m3, m4 = (np.asarray(m, dtype = float) for m in (mean, m2, m3, m4))
+    # scipy treats a variance lost in floating point precision as zero
+    zero = m2 <= (np.finfo(float).eps * mean) ** 2
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        std = np.sqrt(m2)
+        skewness = np.where(zero, np.nan, m3 / m2 ** 1.5)
+        kurt = np.where(zero, np.nan, m4 / m2 ** 2 - 3)
+    return std, skewness, kurt
+
+class MomentAccumulator:
+    '''Streaming per-column moments. Chunks of rows are folded in with update, and partial accumulators
+       (e.g. from different workers) with merge, using the pairwise update formulas of Pébay (2008).'''
+
+    def __init__(self):
+        self.n = 0
+        self.mean = self.M2 = self.M3 = self.M4 = None
+
+    def update(self, chunk):
+        chunk = np.asarray(chunk, dtype = float)
+        if len(chunk) == 0:
+            return self
+        other = MomentAccumulator()
+        other.n = len(chunk)
+        other.mean, m2, m3, m4 = central_moments(chunk, axis = 0)
+        other.M2, other.M3, other.M4 = m2 * other.n, m3 * other.n, m4 * other.n
+        return self.merge(other)
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.M2, self.M3, self.M4 = other.n, other.mean, other.M2, other.M3, other.M4
+            return self
+
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        delta2 = delta * delta
+
+        M2 = self.M2 + other.M2 + delta2 * na * nb / n
+        M3 = self.M3 + other.M3 + delta2 * delta * na * nb * (na - nb) / n ** 2 + \
+             3 * delta * (na * other.M2 - nb * self.M2) / n
+        M4 = self.M4 + other.M4 + delta2 * delta2 * na * nb * (na * na - na * nb + nb * nb) / n ** 3 + \
+             6 * delta2 * (na * na * other.M2 + nb * nb * self.M2) / n ** 2 + \
+             4 * delta * (na * other.M3 - nb * self.M3) / n
+
+        self.n = n
+        self.mean = self.mean + delta * nb / n
+        self.M2, self.M3, self.M4 = M2, M3, M4
+        return self
+
+    def central_moments(self):
+        return self.mean, self.M2 / self.n, self.M3 / self.n, self.M4 / self.n
+
+    def standardized_moments(self):
+        return standardized_moments(*self.central_moments())
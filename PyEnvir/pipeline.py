@@ -0,0 +1,244 @@
+'''Content-addressed DAG runner for the meta-learning workflow.
+
+Every step is a node: a module-level function, the upstream nodes it reads from and JSON-serialisable parameters.
+A node's key hashes its function name, its parameters and the keys of its inputs, and its artifacts live in
+<store>/<key>/. A node is stale when that folder does not exist yet; only stale nodes run, each as soon as all its
+inputs are available, over a pool of worker processes. Changing a parameter therefore changes the keys of the node
+and of everything downstream of it, and nothing else.
+
+Step functions are called as function(inputs, output, **params), where inputs maps each input name to the artifact
+folder of that upstream node and output is the (empty) folder to write to.
+'''
+
+import os, json, shlex, shutil, hashlib, argparse, subprocess
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import artificial_dataset_generation as generation
+from alpha_calculation import process_file as alpha_file
+from accuracy_generation import fold_accuracies
+from accuracy_grouping import read_accuracies
+from meta_labeling import label_datasets
+from conventional_meta_feature_generation import process_dataset as meta_feature_file, names_list
+from meta_feature_store import MetaFeatureStore
+
+COMPLETE_MARKER = 'node.json'
+
+class Node:
+    def __init__(self, name, function, inputs, params):
+        self.name = name
+        self.function = function
+        self.inputs = inputs
+        self.params = params
+        self.key = self.compute_key()
+
+    def compute_key(self):
+        # the module name is __main__ or pipeline depending on how the workflow was launched, so it is left out
+        description = {
+            'function': self.function.__qualname__,
+            'params': self.params,
+            'inputs': { name: node.key for name, node in self.inputs.items() },
+        }
+        return hashlib.sha1(json.dumps(description, sort_keys = True).encode()).hexdigest()
+
+def run_node(function, inputs, params, store, key, description):
+    '''Run one node into a temporary folder and move it into place, so a store folder is always complete'''
+    output = os.path.join(store, key)
+    temp_output = f'{output}.{os.getpid()}.tmp'
+    shutil.rmtree(temp_output, ignore_errors = True)
+    os.makedirs(temp_output)
+    try:
+        function(inputs, temp_output, **params)
+        with open(os.path.join(temp_output, COMPLETE_MARKER), 'w') as file:
+            json.dump(description, file, indent = 1, sort_keys = True)
+        try:
+            os.replace(temp_output, output)
+        except OSError:
+            # another run finished the same node first; its (identical) artifacts stand
+            if not os.path.exists(os.path.join(output, COMPLETE_MARKER)):
+                raise
+    finally:
+        shutil.rmtree(temp_output, ignore_errors = True)
+
+class Pipeline:
+    def __init__(self, store):
+        self.store = os.path.abspath(store)
+        self.nodes = {}
+
+    def add(self, name, function, inputs = None, **params):
+        if name in self.nodes:
+            raise ValueError(f'Duplicate node {name}. ')
+        node = Node(name, function, inputs or {}, params)
+        self.nodes[name] = node
+        return node
+
+    def path(self, node):
+        return os.path.join(self.store, node.key)
+
+    def is_fresh(self, node):
+        return os.path.exists(os.path.join(self.path(node), COMPLETE_MARKER))
+
+    def upstream(self, targets):
+        '''The targets and all nodes they depend on, inputs before the nodes reading them'''
+        order, seen = [], set()
+        def visit(node):
+            if node.name in seen:
+                return
+            seen.add(node.name)
+            for input_node in node.inputs.values():
+                visit(input_node)
+            order.append(node)
+        for node in targets:
+            visit(node)
+        return order
+
+    def run(self, targets = None, workers = None):
+        '''Bring the targets (all nodes by default) up to date. Returns the status of every node considered:
+           cached, ran, failed (with the error) or skipped (an input failed)'''
+        os.makedirs(self.store, exist_ok = True)
+        nodes = self.upstream(targets or list(self.nodes.values()))
+        status = { node.name: 'cached' for node in nodes if self.is_fresh(node) }
+        waiting = [node for node in nodes if node.name not in status]
+        print(f'{len(nodes) - len(waiting)} of {len(nodes)} nodes up to date, {len(waiting)} to run')
+
+        running = {}
+        with ProcessPoolExecutor(max_workers = workers) as executor:
+            while waiting or running:
+                still_waiting = []
+                for node in waiting:
+                    input_status = [status.get(input_node.name) for input_node in node.inputs.values()]
+                    if any(s is not None and s.startswith(('failed', 'skipped')) for s in input_status):
+                        status[node.name] = 'skipped'
+                    elif all(s in ('cached', 'ran') for s in input_status):
+                        inputs = { name: self.path(input_node) for name, input_node in node.inputs.items() }
+                        description = { 'name': node.name, 'function': node.function.__qualname__, 'params': node.params,
+                                        'inputs': { name: input_node.key for name, input_node in node.inputs.items() } }
+                        future = executor.submit(run_node, node.function, inputs, node.params, self.store, node.key, description)
+                        running[future] = node
+                    else:
+                        still_waiting.append(node)
+                waiting = still_waiting
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when = FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    try:
+                        future.result()
+                        status[node.name] = 'ran'
+                        print(f'{node.name}\t{node.key}')
+                    except Exception as e:
+                        status[node.name] = f'failed: {type(e).__name__}: {e}'
+                        print(f'{node.name} failed: {type(e).__name__}: {e}')
+        return status
+
+#workflow steps
+
+def features_step(inputs, output, k, n_dataset, seed, grid_size):
+    features, centroid_labels = generation.generate_features(k, generation.dataset_seed(seed, k, n_dataset), grid_size)
+    np.save(os.path.join(output, 'features.npy'), features)
+    np.save(os.path.join(output, 'centroid_labels.npy'), centroid_labels)
+
+def label_step(inputs, output, k, n_dataset, seed, labeler, labeler_params):
+    features = np.load(os.path.join(inputs['features'], 'features.npy'))
+    centroid_labels = np.load(os.path.join(inputs['features'], 'centroid_labels.npy'))
+    labels = generation.label_dataset(features, centroid_labels, labeler, k, generation.dataset_seed(seed, k, n_dataset), labeler_params)
+    generation.write_dataset(os.path.join(output, 'dataset.csv'), features, labels)
+
+def alpha_step(inputs, output):
+    alpha_file(os.path.join(inputs['dataset'], 'dataset.csv'), output)
+
+def shell_quote(argument):
+    return subprocess.list2cmdline([argument]) if os.name == 'nt' else shlex.quote(argument)
+
+def cv_step(inputs, output, command, algorithm):
+    '''Run the external cross-validation (MLCore) on one dataset; command is a shell command template with the
+       placeholders {dataset}, {algorithm} and {output}, the CV result file to write. The values are quoted for
+       the shell, so the placeholders must not be quoted in the template'''
+    subprocess.run(command.format(dataset = shell_quote(os.path.join(inputs['dataset'], 'dataset.csv')),
+                                  algorithm = shell_quote(algorithm), output = shell_quote(os.path.join(output, 'cv.csv'))),
+                   shell = True, check = True)
+
+def accuracy_step(inputs, output, folds):
+    accuracies = fold_accuracies(os.path.join(inputs['cv'], 'cv.csv'), folds)
+    with open(os.path.join(output, 'accuracy.csv'), 'w') as file:
+        file.write(','.join(map(str, accuracies.tolist())) + '\n')
+
+def grouping_step(inputs, output):
+    '''One "name,accuracies..." row per dataset of one algorithm, as meta_labeling reads them'''
+    lines = [f"{name},{','.join(map(str, read_accuracies(os.path.join(folder, 'accuracy.csv')).tolist()))}"
+             for name, folder in sorted(inputs.items())]
+    with open(os.path.join(output, 'accuracies.csv'), 'w') as file:
+        file.write('\n'.join(lines) + '\n')
+
+def meta_label_step(inputs, output, alpha):
+    label_datasets({ algorithm: os.path.join(folder, 'accuracies.csv') for algorithm, folder in inputs.items() }, output, alpha)
+
+def meta_feature_step(inputs, output):
+    store_filename = os.path.join(output, 'meta_features.mfs')
+    MetaFeatureStore(store_filename, names_list)
+    status, duration, _ = meta_feature_file(inputs['dataset'], store_filename, 'dataset.csv')
+    # process_dataset reports failures instead of raising; raise so the node is failed and retried on the next run
+    if status != 'ok':
+        raise RuntimeError(f'meta-features not computed: {status}')
+    with open(os.path.join(output, 'status.csv'), 'w') as file:
+        file.write(f'status,duration\n"{status}",{"" if duration is None else duration}\n')
+
+def build_workflow(pipeline, seed, max_k = 9, datasets_per_level = 10, grid_size = 25, labelers = None,
+                   cv_command = None, algorithms = ('DT', 'KNN', 'NB'), folds = 10, alpha = 0.05):
+    '''Add the artificial dataset workflow to a pipeline. labelers maps labeler names to estimator parameter overrides.
+       Without a CV command the workflow stops at datasets, alphas and meta-features. Returns the final nodes.'''
+    labelers = labelers if labelers is not None else { labeler: {} for labeler in generation.LABELERS }
+    datasets, finals = {}, []
+    for k in range(1, max_k + 1):
+        for n_dataset in range(datasets_per_level):
+            features = pipeline.add(f'features/{k}-{n_dataset}', features_step, k = k, n_dataset = n_dataset, seed = seed, grid_size = grid_size)
+            for labeler, labeler_params in labelers.items():
+                name = f'{(k - 1) * datasets_per_level + n_dataset}_{labeler}'
+                datasets[name] = pipeline.add(f'dataset/{name}', label_step, { 'features': features }, k = k, n_dataset = n_dataset,
+                                              seed = seed, labeler = labeler, labeler_params = labeler_params)
+                finals.append(pipeline.add(f'alpha/{name}', alpha_step, { 'dataset': datasets[name] }))
+                finals.append(pipeline.add(f'meta-features/{name}', meta_feature_step, { 'dataset': datasets[name] }))
+
+    if cv_command:
+        groups = {}
+        for algorithm in algorithms:
+            accuracies = {}
+            for name, dataset in datasets.items():
+                cv = pipeline.add(f'cv/{name}-{algorithm}', cv_step, { 'dataset': dataset }, command = cv_command, algorithm = algorithm)
+                accuracies[name] = pipeline.add(f'accuracy/{name}-{algorithm}', accuracy_step, { 'cv': cv }, folds = folds)
+            groups[algorithm] = pipeline.add(f'grouping/{algorithm}', grouping_step, accuracies)
+        finals.append(pipeline.add('meta-labels', meta_label_step, groups, alpha = alpha))
+    return finals
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = 'Run the artificial dataset meta-learning workflow, rebuilding only stale steps. ')
+    parser.add_argument('--store', default = os.path.join(os.getcwd(), 'store'), help = 'artifact store folder')
+    parser.add_argument('--seed', type = int, required = True)
+    parser.add_argument('--max-k', type = int, default = 9)
+    parser.add_argument('--datasets-per-level', type = int, default = 10)
+    parser.add_argument('--grid-size', type = int, default = 25)
+    parser.add_argument('--labeler', nargs = 2, action = 'append', metavar = ('NAME', 'PARAMS'),
+                        help = 'labeler and its estimator parameters as JSON, e.g. knn \'{"n_neighbors": 5}\'; all labelers with defaults if omitted')
+    parser.add_argument('--cv-command', help = 'cross-validation command with {dataset}, {algorithm} and {output} placeholders')
+    parser.add_argument('--algorithm', action = 'append', help = 'algorithms cross-validated, DT, KNN and NB by default')
+    parser.add_argument('--folds', type = int, default = 10)
+    parser.add_argument('--alpha', type = float, default = 0.05)
+    parser.add_argument('--workers', type = int, default = None, help = 'number of worker processes')
+    args = parser.parse_args(argv)
+
+    labelers = { name: json.loads(params) for name, params in args.labeler } if args.labeler else None
+    pipeline = Pipeline(args.store)
+    finals = build_workflow(pipeline, args.seed, args.max_k, args.datasets_per_level, args.grid_size, labelers,
+                            args.cv_command, tuple(args.algorithm or ('DT', 'KNN', 'NB')), args.folds, args.alpha)
+    status = pipeline.run(finals, args.workers)
+
+    failed = { name: s for name, s in status.items() if s.startswith(('failed', 'skipped')) }
+    print(f"{sum(s == 'ran' for s in status.values())} ran, {sum(s == 'cached' for s in status.values())} cached, {len(failed)} failed or skipped")
+    if 'meta-labels' in pipeline.nodes and status.get('meta-labels') in ('cached', 'ran'):
+        print(f"Meta-labels: {pipeline.path(pipeline.nodes['meta-labels'])}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,24 +1,52 @@
-import os, csv 
+import os, argparse, matplotlib
+matplotlib.use("Agg")
+import numpy as np
 from matplotlib import pyplot
+from concurrent.futures import ProcessPoolExecutor
+from dataset_cache import load_dataset
 
-datasetPath = f"{os.path.expanduser('~\\Desktop')}\\dataset eg"
-figurePath = f"{os.path.expanduser('~\\Desktop')}\\dataset eg"
+labelColors = ["#005BBB", "#FFD500"]
+template = None
 
-for filename in os.listdir(datasetPath):
-    with open(os.path.join(datasetPath, filename)) as file:
-        table = [row for row in csv.reader(file)]
-        labelStats = [[], []]
-        for r in range(len(table)):
-            labelStats[int(float(table[r][2]))].append(r)
-        labelColors = ["#005BBB", "#FFD500"]
-        pyplot.clf()
-        pyplot.axes().set_aspect(aspect = 1)
-        for labelValue in [0, 1]:
-            xValues = []
-            yValues = []
-            for r in labelStats[labelValue]:
-                xValues.append(float(table[r][0]))
-                yValues.append(float(table[r][1]))
-            pyplot.plot(xValues, yValues, 's', color = labelColors[labelValue], markersize = 4)
-        pyplot.savefig(os.path.join(figurePath, f"{filename.split('.')[0]}.png"), dpi = 300)
-    print(f"Finished plotting {filename}")
+def BuildTemplate():
+    '''Build the figure, axes and one square-marker scatter per label once per process; files only update their offsets'''
+    global template
+    figure = pyplot.figure()
+    axes = figure.add_subplot()
+    axes.set_aspect(aspect = 1)
+    # markersize 4 in points, scatter sizes are in points squared
+    artists = [axes.scatter([], [], marker = 's', s = 16, color = color, linewidths = 0) for color in labelColors]
+    template = (figure, axes, artists)
+
+def PlotDataset(filename, figurePath):
+    figure, axes, artists = template
+    table = np.asarray(load_dataset(filename, False).table)
+    points = table[:, :2]
+    labels = table[:, 2].astype(int)
+    for labelValue, artist in enumerate(artists):
+        artist.set_offsets(points[labels == labelValue])
+
+    # offsets do not take part in autoscaling, so apply the default 5% margins by hand
+    low, high = points.min(axis = 0), points.max(axis = 0)
+    margin = (high - low) * 0.05
+    axes.set_xlim(low[0] - margin[0], high[0] + margin[0])
+    axes.set_ylim(low[1] - margin[1], high[1] + margin[1])
+    figure.savefig(os.path.join(figurePath, f"{os.path.basename(filename).split('.')[0]}.png"), dpi = 300)
+    return filename
+
+def main(argv = None):
+    desktop = os.path.join(os.path.expanduser('~'), "Desktop")
+    parser = argparse.ArgumentParser(description = "Plot two-feature datasets, one PNG per dataset. ")
+    parser.add_argument("--dataset-path", default = os.path.join(desktop, "dataset eg"))
+    parser.add_argument("--figure-path", default = os.path.join(desktop, "dataset eg"))
+    parser.add_argument("--workers", type = int, default = None, help = "number of rendering processes")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.figure_path, exist_ok = True)
+    filenames = [os.path.join(args.dataset_path, filename) for filename in os.listdir(args.dataset_path) if not filename.endswith(".png")]
+    with ProcessPoolExecutor(max_workers = args.workers, initializer = BuildTemplate) as executor:
+        for filename in executor.map(PlotDataset, filenames, [args.figure_path] * len(filenames), chunksize = 16):
+            print(f"Finished plotting {filename}")
+
+if __name__ == "__main__":
+    main()
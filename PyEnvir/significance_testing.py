@@ -0,0 +1,87 @@
+'''Vectorized t-tests between two groups of scores, with multiple-comparison correction.
+
+A score matrix is loaded once and all comparisons run as a single ttest_ind/ttest_rel call along the score axis.
+Outcomes use the encoding of meta_labeling: 0 draw (cannot reject the null hypothesis at the given alpha),
+1 the left group is better, 2 the right group is better, ERROR where the test is undefined (e.g. constant scores).
+With a correction, rejection is decided on the adjusted p-values (Holm or Benjamini-Hochberg).
+'''
+
+import argparse
+import numpy as np
+from scipy import stats
+from meta_labeling import ERROR
+
+OUTCOME_NAMES = { 0: "draw", 1: "left", 2: "right", ERROR: "error" }
+
+def load_score_matrix(filename, has_header = True):
+    '''Names in the first column and the float matrix of the remaining columns of a CSV'''
+    raw = np.loadtxt(filename, delimiter = ',', dtype = str, skiprows = 1 if has_header else 0, ndmin = 2)
+    return raw[:, 0].tolist(), raw[:, 1:].astype(float)
+
+def t_test(left, right, axis = -1, paired = False):
+    '''t-statistics and two-sided p-values of every comparison; left and right broadcast against each other'''
+    left, right = np.broadcast_arrays(np.asarray(left, dtype = float), np.asarray(right, dtype = float))
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        t, p = (stats.ttest_rel if paired else stats.ttest_ind)(left, right, axis = axis)
+    return np.asarray(t), np.asarray(p)
+
+def holm(p):
+    '''Holm step-down adjusted p-values over all non-nan entries of p'''
+    p = np.asarray(p, dtype = float)
+    adjusted = np.full(p.shape, np.nan)
+    valid = np.flatnonzero(~np.isnan(p))
+    order = valid[np.argsort(p.flat[valid], kind = 'stable')]
+    m = len(order)
+    steps = (m - np.arange(m)) * p.flat[order]
+    adjusted.flat[order] = np.minimum(np.maximum.accumulate(steps), 1)
+    return adjusted
+
+def benjamini_hochberg(p):
+    '''Benjamini-Hochberg (false discovery rate) adjusted p-values over all non-nan entries of p'''
+    p = np.asarray(p, dtype = float)
+    adjusted = np.full(p.shape, np.nan)
+    valid = np.flatnonzero(~np.isnan(p))
+    order = valid[np.argsort(p.flat[valid], kind = 'stable')]
+    m = len(order)
+    steps = m / np.arange(1, m + 1) * p.flat[order]
+    adjusted.flat[order] = np.minimum(np.minimum.accumulate(steps[::-1])[::-1], 1)
+    return adjusted
+
+CORRECTIONS = { "none": lambda p: np.asarray(p, dtype = float), "holm": holm, "bh": benjamini_hochberg }
+
+def outcomes(t, p, alpha = 0.05):
+    outcome = np.where(p > alpha, 0, np.where(t > 0, 1, 2))
+    outcome[np.isnan(t) | np.isnan(p)] = ERROR
+    return outcome
+
+def compare(left, right, alpha = 0.05, correction = "none", axis = -1, paired = False):
+    '''t, p, adjusted p and outcome of every comparison'''
+    t, p = t_test(left, right, axis, paired)
+    adjusted = CORRECTIONS[correction](p)
+    return t, p, adjusted, outcomes(t, adjusted, alpha)
+
+def results_table(names, t, p, adjusted, outcome):
+    '''Tidy CSV lines, one comparison per row'''
+    lines = ["comparison,t-statistic,p-value,adjusted-p-value,outcome"]
+    lines += [f"{name},{tValue},{pValue},{aValue},{OUTCOME_NAMES[o]}"
+              for name, tValue, pValue, aValue, o in zip(names, t.tolist(), p.tolist(), adjusted.tolist(), outcome.tolist())]
+    return lines
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "t-test the left and right score columns of every row of a CSV. ")
+    parser.add_argument("score_file", help = "header row, then a name and the left then right scores per row")
+    parser.add_argument("--output", default = "significance.csv")
+    parser.add_argument("--folds", type = int, default = None, help = "scores per side, half of the score columns by default")
+    parser.add_argument("--alpha", type = float, default = 0.05)
+    parser.add_argument("--correction", choices = list(CORRECTIONS), default = "none")
+    parser.add_argument("--paired", action = "store_true", help = "use the paired (related samples) t-test")
+    args = parser.parse_args(argv)
+
+    names, scores = load_score_matrix(args.score_file)
+    folds = args.folds or scores.shape[1] // 2
+    t, p, adjusted, outcome = compare(scores[:, :folds], scores[:, folds:2 * folds], args.alpha, args.correction, paired = args.paired)
+    with open(args.output, 'w') as file:
+        file.write('\n'.join(results_table(names, t, p, adjusted, outcome)))
+
+if __name__ == "__main__":
+    main()
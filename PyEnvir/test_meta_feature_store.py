@@ -0,0 +1,31 @@
+import os, shutil, tempfile, unittest
+import numpy as np
+from meta_feature_store import MetaFeatureStore
+
+class TornWriteTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, 'meta_features.mfs')
+        self.store = MetaFeatureStore(self.filename, ['a', 'b', 'c'])
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_appends_after_a_torn_write_stay_aligned(self):
+        self.store.append('d1', [1.0, 2.0, 3.0])
+        # a writer killed mid-write leaves part of a record behind
+        with open(self.filename, 'ab') as file:
+            file.write(b'torn-partial' + bytes(7))
+        self.assertEqual(list(MetaFeatureStore(self.filename).index()), ['d1'])
+
+        self.store.append('d2', [4.0, 5.0, 6.0])
+        self.store.append('d3', [7.0, 8.0, 9.0])
+
+        store = MetaFeatureStore(self.filename)
+        names, matrix = store.latest()
+        self.assertEqual(names, ['d1', 'd2', 'd3'])
+        np.testing.assert_array_equal(matrix, [[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        self.assertEqual((os.path.getsize(self.filename) - store.offset) % store.dtype.itemsize, 0)
+
+if __name__ == '__main__':
+    unittest.main()